@@ -1,44 +1,30 @@
 import subprocess
 from utils.llms import query_groq_llm, query_gemini_llm, query_ollama_llm
-from utils.prompts import (
-    zero_shot_prompt, one_shot_prompt, few_shot_prompt,
-    chain_of_thought_prompt, react_prompt, self_ask_prompt,
-    tree_of_thought_prompt, instruction_constraints_prompt,
-    persona_based_prompt_template
-)
+from utils.prompts import PROMPT_TEMPLATES, build_prompt
 from utils.comparison import run_comparative_evaluation
 from utils.report_generator import extract_log_metrics, generate_report
 
 
 def select_prompt_templates():
     print("\nChoose Prompting Strategies (comma-separated numbers):")
-    prompt_mapping = {
-        "1": zero_shot_prompt,
-        "2": one_shot_prompt,
-        "3": few_shot_prompt,
-        "4": chain_of_thought_prompt,
-        "5": react_prompt,
-        "6": self_ask_prompt,
-        "7": tree_of_thought_prompt,
-        "8": instruction_constraints_prompt,
-        "9": persona_based_prompt_template
-    }
-    for key, fn in prompt_mapping.items():
-        print(f"{key}. {fn.__name__.replace('_', ' ').title()}")
+    for key, entry in PROMPT_TEMPLATES.items():
+        print(f"{key}. {entry['label']}")
 
     choices = input("Enter prompt numbers (e.g., 1,3,6): ").strip().split(',')
     prompt_templates = {}
 
     for choice in choices:
         choice = choice.strip()
-        if choice == "9":
+        if choice not in PROMPT_TEMPLATES:
+            continue
+        if PROMPT_TEMPLATES[choice]["text"] is None:
             role = input("Enter persona role (e.g., detective): ").strip()
             tone = input("Enter tone (e.g., friendly, serious): ").strip()
             style = input("Enter style (e.g., concise, detailed): ").strip()
-            prompt_templates[f"persona_{role}_{tone}_{style}"] = persona_based_prompt_template(role, tone, style)
-        elif choice in prompt_mapping:
-            fn = prompt_mapping[choice]
-            prompt_templates[fn.__name__] = fn()
+            entry = build_prompt(choice, role, tone, style)
+        else:
+            entry = build_prompt(choice)
+        prompt_templates[entry["name"]] = entry["text"]
 
     return prompt_templates
 
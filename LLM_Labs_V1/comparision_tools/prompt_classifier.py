@@ -1,12 +1,48 @@
+import re
+
+# Category -> keywords, in priority order: a prompt is labelled with the first category
+# that has any hit, and "General" when none does. Keywords match whole words only (plus
+# a plural "s"/"es"), so "show" is not "how" and "mathematics" is not "math".
+PROMPT_CATEGORIES = {
+    "Math": ["prove", "solve", "equation", "math", "calculate"],
+    "Creative": ["story", "poem", "imagine", "creative"],
+    "Reasoning": ["why", "how", "explain", "analyze", "reason"],
+    "Knowledge": ["when", "where", "what", "who", "define", "describe"],
+}
+DEFAULT_CATEGORY = "General"
+
+# Every keyword form -> its category, so a prompt is scanned once, word by word, with a
+# dict lookup per word however many keywords there are
+_KEYWORD_CATEGORIES = {}
+for _category, _keywords in PROMPT_CATEGORIES.items():
+    for _keyword in _keywords:
+        for _suffix in ("", "s", "es"):
+            _KEYWORD_CATEGORIES.setdefault(_keyword + _suffix, _category)
+_WORD = re.compile(r"\w+")
+
+
+def score_prompts(prompts: list) -> list:
+    """Keyword hits per category for many prompts: [{category: count}], every category present."""
+    find_words, lookup = _WORD.findall, _KEYWORD_CATEGORIES.get
+    scores = []
+    for prompt in prompts:
+        hits = dict.fromkeys(PROMPT_CATEGORIES, 0)
+        for category in map(lookup, find_words(prompt.lower())):
+            if category:
+                hits[category] += 1
+        scores.append(hits)
+    return scores
+
+
+def classify_prompts(prompts: list) -> list:
+    """Category label for each prompt (see PROMPT_CATEGORIES for the priority order)."""
+    find_words, lookup = _WORD.findall, _KEYWORD_CATEGORIES.get
+    labels = []
+    for prompt in prompts:
+        found = set(map(lookup, find_words(prompt.lower())))
+        labels.append(next((category for category in PROMPT_CATEGORIES if category in found), DEFAULT_CATEGORY))
+    return labels
+
+
 def classify_prompt(prompt: str) -> str:
-    prompt = prompt.lower()
-    if any(word in prompt for word in ["prove", "solve", "equation", "math", "calculate"]):
-        return "Math"
-    elif any(word in prompt for word in ["story", "poem", "imagine", "creative"]):
-        return "Creative"
-    elif any(word in prompt for word in ["why", "how", "explain", "analyze", "reason"]):
-        return "Reasoning"
-    elif any(word in prompt for word in ["when", "where", "what", "who", "define", "describe"]):
-        return "Knowledge"
-    else:
-        return "General"
+    return classify_prompts([prompt])[0]
@@ -1,7 +1,100 @@
-from transformers import AutoTokenizer
+import logging
+import threading
 
-# Choose any tokenizer depending on your model
-tokenizer = AutoTokenizer.from_pretrained("gpt2")
+# Copied verbatim from LLM_Labs_V2/comparision_tools/tokenizer.py: V1 and V2 are separate apps,
+# each run from its own directory with its own top-level packages, so fixes go to both.
 
-def count_tokens(text: str) -> int:
-    return len(tokenizer.encode(text, truncation=True))
+# Model-name prefix -> tokenizer. "tiktoken:<encoding>" uses tiktoken, anything else is
+# a Hugging Face repo loaded as a fast tokenizer. The first matching prefix wins;
+# names are matched lower-cased and without an "org/" prefix ("openai/gpt-oss-20b").
+# A prefix ending in "-" also matches the bare name ("o1-" matches "o1" and "o1-mini",
+# but not "o1x").
+TOKENIZER_FAMILIES = [
+    ("gpt-4o", "tiktoken:o200k_base"),
+    ("gpt-oss", "tiktoken:o200k_base"),
+    ("o1-", "tiktoken:o200k_base"),
+    ("o3-", "tiktoken:o200k_base"),
+    ("gpt-4", "tiktoken:cl100k_base"),
+    ("gpt-3.5", "tiktoken:cl100k_base"),
+    ("llama3", "meta-llama/Meta-Llama-3-8B"),
+    ("llama-3", "meta-llama/Meta-Llama-3-8B"),
+    ("llama2", "meta-llama/Llama-2-7b-hf"),
+    ("llama-2", "meta-llama/Llama-2-7b-hf"),
+    ("qwen", "Qwen/Qwen2.5-0.5B"),
+]
+DEFAULT_TOKENIZER = "gpt2"
+
+# Used when a tokenizer cannot be loaded (the meta-llama repos are gated and need an
+# accepted license plus HF_TOKEN); anything not listed falls back to DEFAULT_TOKENIZER.
+# Llama 3's vocabulary extends cl100k, so cl100k is a close (not exact) count.
+TOKENIZER_FALLBACKS = {
+    "meta-llama/Meta-Llama-3-8B": "tiktoken:cl100k_base",
+}
+
+_tokenizers = {}
+_tokenizer_locks = {}
+_tokenizers_lock = threading.Lock()
+
+
+def register_tokenizer(prefix: str, spec: str):
+    """Map models whose name starts with `prefix` to `spec`, ahead of the built-in families."""
+    TOKENIZER_FAMILIES.insert(0, (prefix.lower(), spec))
+
+
+def tokenizer_for(model: str = None) -> str:
+    """Tokenizer spec used for `model` (DEFAULT_TOKENIZER when unknown)."""
+    if not model:
+        return DEFAULT_TOKENIZER
+    name = model.lower().rsplit("/", 1)[-1] + "-"
+    return next((spec for prefix, spec in TOKENIZER_FAMILIES if name.startswith(prefix)), DEFAULT_TOKENIZER)
+
+
+def _load(spec: str):
+    """Return a function that maps a list of texts to token counts."""
+    if spec.startswith("tiktoken:"):
+        import tiktoken
+        encoding = tiktoken.get_encoding(spec.split(":", 1)[1])
+        return lambda texts: [len(ids) for ids in encoding.encode_ordinary_batch(texts)]
+
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(spec, use_fast=True)
+    # Counting only: no truncation and no "longer than model max length" warning
+    tokenizer.model_max_length = int(1e30)
+    return lambda texts: [
+        len(ids) for ids in tokenizer(texts, add_special_tokens=False, return_attention_mask=False)["input_ids"]
+    ]
+
+
+def _get_counter(spec: str):
+    with _tokenizers_lock:
+        counter = _tokenizers.get(spec)
+        if counter is not None:
+            return counter
+        spec_lock = _tokenizer_locks.setdefault(spec, threading.Lock())
+
+    # Loading (possibly a Hub download) holds only this spec's lock, so other tokenizers load in parallel
+    with spec_lock:
+        counter = _tokenizers.get(spec)
+        if counter is None:
+            try:
+                counter = _load(spec)
+            except Exception as e:
+                if spec == DEFAULT_TOKENIZER:
+                    raise
+                fallback = TOKENIZER_FALLBACKS.get(spec, DEFAULT_TOKENIZER)
+                logging.warning(f"Tokenizer {spec} unavailable ({e}); counting with {fallback}")
+                counter = _get_counter(fallback)
+            with _tokenizers_lock:
+                _tokenizers[spec] = counter
+        return counter
+
+
+def count_tokens_batch(texts: list, model: str = None) -> list:
+    """Exact token counts for many texts, encoded in one call with `model`'s tokenizer."""
+    if not texts:
+        return []
+    return _get_counter(tokenizer_for(model))(list(texts))
+
+
+def count_tokens(text: str, model: str = None) -> int:
+    return count_tokens_batch([text], model)[0]
@@ -2,15 +2,11 @@ from flask import Flask, render_template, request, jsonify, send_file
 import subprocess
 import os
 import json
-from utils.llms import query_groq_llm, query_gemini_llm, query_ollama_llm
-from utils.prompts import (
-    zero_shot_prompt, one_shot_prompt, few_shot_prompt,
-    chain_of_thought_prompt, react_prompt, self_ask_prompt,
-    tree_of_thought_prompt, instruction_constraints_prompt,
-    persona_based_prompt_template
-)
+from utils.llms import query_groq_llm, query_gemini_llm, query_ollama_llm, query_mock_llm
+from utils.prompts import PROMPT_TEMPLATES, build_prompt
 from utils.comparison import run_comparative_evaluation
 from utils.report_generator import extract_log_metrics, generate_report
+from utils.results_store import start_run, record_result, fetch_records, run_totals, latest_run_id
 from pathlib import Path
 import time
 from datetime import datetime
@@ -28,15 +24,8 @@ def index():
 def get_prompt_templates():
     """Get available prompt templates"""
     templates = {
-        "1": {"name": "Zero Shot", "function": "zero_shot_prompt"},
-        "2": {"name": "One Shot", "function": "one_shot_prompt"},
-        "3": {"name": "Few Shot", "function": "few_shot_prompt"},
-        "4": {"name": "Chain of Thought", "function": "chain_of_thought_prompt"},
-        "5": {"name": "ReAct", "function": "react_prompt"},
-        "6": {"name": "Self Ask", "function": "self_ask_prompt"},
-        "7": {"name": "Tree of Thought", "function": "tree_of_thought_prompt"},
-        "8": {"name": "Instruction + Constraints", "function": "instruction_constraints_prompt"},
-        "9": {"name": "Persona Based", "function": "persona_based_prompt_template"}
+        key: {"name": entry["label"], "function": entry["name"], "id": entry["id"]}
+        for key, entry in PROMPT_TEMPLATES.items()
     }
     return jsonify(templates)
 
@@ -169,25 +158,12 @@ def single_chat():
     
     try:
         # Get prompt template
-        prompt_mapping = {
-            "1": zero_shot_prompt,
-            "2": one_shot_prompt,
-            "3": few_shot_prompt,
-            "4": chain_of_thought_prompt,
-            "5": react_prompt,
-            "6": self_ask_prompt,
-            "7": tree_of_thought_prompt,
-            "8": instruction_constraints_prompt,
-            "9": persona_based_prompt_template
-        }
-        
-        if prompt_template_id == "9":
-            role = persona_config.get('role', 'assistant')
-            tone = persona_config.get('tone', 'professional')
-            style = persona_config.get('style', 'clear and concise')
-            prompt = persona_based_prompt_template(role, tone, style)
-        else:
-            prompt = prompt_mapping[prompt_template_id]()
+        prompt = build_prompt(
+            prompt_template_id,
+            role=persona_config.get('role', 'assistant'),
+            tone=persona_config.get('tone', 'professional'),
+            style=persona_config.get('style', 'clear and concise')
+        )["text"]
         
         # Query the LLM
         if provider == "groq":
@@ -196,6 +172,8 @@ def single_chat():
             response = query_gemini_llm(model=model, user_input=question, prompt=prompt)
         elif provider == "ollama":
             response = query_ollama_llm(model=model, user_input=question, prompt=prompt)
+        elif provider == "mock":
+            response = query_mock_llm(model=model, user_input=question, prompt=prompt)
         else:
             return jsonify({"success": False, "error": "Unsupported provider"})
         
@@ -215,30 +193,24 @@ def comparative_evaluation():
     try:
         # Build prompt templates
         prompt_templates = {}
-        prompt_mapping = {
-            "1": zero_shot_prompt,
-            "2": one_shot_prompt,
-            "3": few_shot_prompt,
-            "4": chain_of_thought_prompt,
-            "5": react_prompt,
-            "6": self_ask_prompt,
-            "7": tree_of_thought_prompt,
-            "8": instruction_constraints_prompt,
-            "9": persona_based_prompt_template
-        }
-        
+        prompt_ids = {}
         for template_id, config in prompt_templates_config.items():
+            entry = build_prompt(
+                template_id,
+                role=config.get('role', 'assistant'),
+                tone=config.get('tone', 'professional'),
+                style=config.get('style', 'clear and concise')
+            )
+            # Same names as before the registry (e.g. "React"), so stored results stay comparable
             if template_id == "9":
-                role = config.get('role', 'assistant')
-                tone = config.get('tone', 'professional')
-                style = config.get('style', 'clear and concise')
-                prompt_templates[f"persona_{role}_{tone}_{style}"] = persona_based_prompt_template(role, tone, style)
+                prompt_name = entry["name"]
             else:
-                fn = prompt_mapping[template_id]
-                prompt_name = fn.__name__.replace('_prompt', '').replace('_', ' ').title()
-                prompt_templates[prompt_name] = fn()
+                prompt_name = entry["name"].replace('_prompt', '').replace('_', ' ').title()
+            prompt_templates[prompt_name] = entry["text"]
+            prompt_ids[prompt_name] = entry["id"]
         
         # Run comparative evaluation and collect detailed results
+        run_id = start_run(user_input, {"providers_models": providers_models, "prompts": list(prompt_templates)})
         detailed_results = []
         total_tests = 0
         total_time = 0
@@ -258,6 +230,8 @@ def comparative_evaluation():
                             response = query_gemini_llm(model=model, user_input=user_input, prompt=prompt)
                         elif provider == "ollama":
                             response = query_ollama_llm(model=model, user_input=user_input, prompt=prompt)
+                        elif provider == "mock":
+                            response = query_mock_llm(model=model, user_input=user_input, prompt=prompt)
                         else:
                             response = f"Unsupported provider: {provider}"
                             
@@ -286,6 +260,10 @@ def comparative_evaluation():
                             "response_time": response_time,
                             "success": False
                         })
+
+                    record = detailed_results[-1]
+                    record_result(run_id, {**record, "prompt_name": prompt_name, "prompt_id": prompt_ids[prompt_name]},
+                                  question=user_input)
         
         # Calculate summary statistics
         avg_response_time = round(total_time / total_tests, 2) if total_tests > 0 else 0
@@ -299,6 +277,7 @@ def comparative_evaluation():
         
         # Store results in session for later use
         session_data['last_comparison'] = {
+            'run_id': run_id,
             'detailed_results': detailed_results,
             'summary': {
                 'total_tests': total_tests,
@@ -311,6 +290,7 @@ def comparative_evaluation():
         return jsonify({
             "success": True,
             "message": "Comparative evaluation completed",
+            "run_id": run_id,
             "detailed_results": detailed_results,
             "summary": {
                 "total_tests": total_tests,
@@ -330,8 +310,22 @@ def generate_report_api():
     user_question = data.get('user_question', '')
     
     try:
-        # Use session data if available, otherwise extract from log
-        if 'last_comparison' in session_data:
+        # Query the results store by run (optionally narrowed to a provider/model);
+        # defaults to the last comparison of this session, then the latest stored run
+        run_id = data.get('run_id') or session_data.get('last_comparison', {}).get('run_id') or latest_run_id()
+        if run_id:
+            records = fetch_records(run_id=run_id, provider=data.get('provider'), model=data.get('model'))
+            detailed_results = [{
+                "provider": r["provider"],
+                "model": r["model"],
+                "prompt_strategy": r["prompt_name"],
+                "response_time": r["response_time"],
+                "success": r["success"],
+                "response": r["response"] if r["success"] else None,
+                "error": r["extra"].get("error"),
+            } for r in records]
+            summary = run_totals(run_id, provider=data.get('provider'), model=data.get('model'))
+        elif 'last_comparison' in session_data:
             comparison_data = session_data['last_comparison']
             detailed_results = comparison_data.get('detailed_results', [])
             summary = comparison_data.get('summary', {})
@@ -371,7 +365,7 @@ DETAILED RESULTS:
    Strategy: {result.get('prompt_strategy', 'Unknown')}
    Status: {status}
    Response Time: {result.get('response_time', 'N/A')}s
-   Response: {result.get('response', result.get('error', 'No response'))[:200]}...
+   Response: {(result.get('response') or result.get('error') or 'No response')[:200]}...
 
 """
         else:
@@ -5,6 +5,7 @@ import textstat  # For syllable count
 
 from utils.llms import query_groq_llm, query_gemini_llm, query_ollama_llm
 from comparision_tools.tokenizer import count_tokens
+from utils.prompts import input_token_count
 from comparision_tools.prompt_classifier import classify_prompt
 
 # Logger setup
@@ -48,7 +49,7 @@ def run_comparative_evaluation(providers_models: dict, prompts: dict, user_input
                 start_time = time.time()
 
                 try:
-                    input_tokens = count_tokens(user_input + prompt)
+                    input_tokens = input_token_count(user_input, prompt, model)
                     prompt_type = classify_prompt(prompt)
                     prompt_length_words = len(prompt.split())
 
@@ -29,4 +29,14 @@ def query_ollama_llm(user_input: str, model: str, prompt: str) -> str:
         model=model,
         messages=[{"role": "user", "content": full_prompt}]
     )
-    return response['message']['content'].strip()
\ No newline at end of file
+    return response['message']['content'].strip()
+
+def query_mock_llm(user_input: str, model: str, prompt: str) -> str:
+    # Local stand-in server from LLM_Labs_V2/utils/mock_llm_server.py (Ollama-compatible API)
+    client = OllamaClient(host=os.getenv("MOCK_LLM_HOST", "http://127.0.0.1:11435"))
+    full_prompt = prompt + "\n" + user_input
+    response = client.chat(
+        model=model,
+        messages=[{"role": "user", "content": full_prompt}]
+    )
+    return response['message']['content'].strip()
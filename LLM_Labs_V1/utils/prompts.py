@@ -1,3 +1,14 @@
+import hashlib
+import threading
+from functools import lru_cache
+
+from comparision_tools.tokenizer import count_tokens, tokenizer_for
+
+# Joins a template and the user's text into the message the providers receive
+# (see utils/llms.py); token counts for the template include it.
+PROMPT_SEPARATOR = "\n"
+
+
 def zero_shot_prompt() -> str:
     """
     Zero-shot prompting template using best practices:
@@ -178,3 +189,80 @@ def persona_based_prompt_template(role: str, tone: str = "professional", style:
         "Respond to the following input while fully embracing your role:"
     )
 
+
+@lru_cache(maxsize=1024)
+def template_id(prompt: str) -> str:
+    """Stable content ID for a prompt: the same text gets the same ID in every app and run."""
+    return "tpl_" + hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
+# Built once at import: menu key -> {"key", "name", "label", "text", "id"}. Persona
+# prompts depend on their role/tone/style, so their text and ID come from build_prompt().
+PROMPT_TEMPLATES = {}
+DYNAMIC_TEMPLATES = {"persona_based_prompt_template"}
+
+
+def _register(key: str, label: str, fn):
+    text = None if fn.__name__ in DYNAMIC_TEMPLATES else fn()
+    PROMPT_TEMPLATES[key] = {
+        "key": key,
+        "name": fn.__name__,
+        "label": label,
+        "text": text,
+        "id": template_id(text) if text is not None else None,
+    }
+
+
+_register("1", "Zero Shot", zero_shot_prompt)
+_register("2", "One Shot", one_shot_prompt)
+_register("3", "Few Shot", few_shot_prompt)
+_register("4", "Chain of Thought", chain_of_thought_prompt)
+_register("5", "ReAct", react_prompt)
+_register("6", "Self Ask", self_ask_prompt)
+_register("7", "Tree of Thought", tree_of_thought_prompt)
+_register("8", "Instruction + Constraints", instruction_constraints_prompt)
+_register("9", "Persona Based", persona_based_prompt_template)
+
+TEMPLATES_BY_NAME = {entry["name"]: entry for entry in PROMPT_TEMPLATES.values()}
+
+
+@lru_cache(maxsize=256)
+def _persona_prompt(role: str, tone: str, style: str) -> str:
+    return persona_based_prompt_template(role, tone, style)
+
+
+def build_prompt(template: str, role: str = "assistant", tone: str = "professional",
+                 style: str = "clear and concise") -> dict:
+    """
+    Registry entry for a menu key ("1") or function name ("zero_shot_prompt").
+
+    Returns {"name", "label", "text", "id"}. The persona template is built from
+    `role`/`tone`/`style`, and its name is persona_<role>_<tone>_<style>.
+    Raises KeyError for an unknown template.
+    """
+    entry = PROMPT_TEMPLATES.get(template) or TEMPLATES_BY_NAME[template]
+    if entry["text"] is not None:
+        return entry
+    text = _persona_prompt(role, tone, style)
+    return {**entry, "name": f"persona_{role}_{tone}_{style}", "text": text, "id": template_id(text)}
+
+
+_token_counts = {}
+_token_counts_lock = threading.Lock()
+
+
+def prompt_token_count(prompt: str, model: str = None) -> int:
+    """Tokens in `prompt` plus its separator, counted once per template and tokenizer."""
+    key = (template_id(prompt), tokenizer_for(model))
+    count = _token_counts.get(key)
+    if count is None:
+        count = count_tokens(prompt + PROMPT_SEPARATOR, model)
+        with _token_counts_lock:
+            _token_counts[key] = count
+    return count
+
+
+def input_token_count(user_input: str, prompt: str, model: str = None) -> int:
+    """Local token count for the message sent to `model`; only the user text is tokenized per call."""
+    return prompt_token_count(prompt, model) + count_tokens(user_input, model)
+
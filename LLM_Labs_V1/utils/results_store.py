@@ -0,0 +1,287 @@
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+# Copied verbatim from LLM_Labs_V2/utils/results_store.py: V1 and V2 are separate apps,
+# each run from its own directory with its own top-level `utils` package, so fixes go to both.
+# Append-only store of every evaluation record, grouped by run.
+# Replaces scraping llm_comparison.log: reports query it by run, provider and model.
+RESULTS_DB = "llm_results.db"
+
+# Readability keys in result["readability"] -> numeric column name
+READABILITY_COLUMNS = {
+    "flesch_reading_ease": "flesch",
+    "smog_index": "smog",
+    "coleman_liau_index": "coleman_liau",
+    "gunning_fog_index": "gunning_fog",
+    "automated_readability_index": "ari",
+    "dale_chall_index": "dale_chall",
+    "forcast_index": "forcast",
+    "linsear_write_index": "linsear_write",
+    "lix": "lix",
+    "rix": "rix",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    user_question TEXT,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    created_at REAL NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_name TEXT,
+    prompt_type TEXT,
+    prompt_length_words INTEGER,
+    question TEXT,
+    success INTEGER NOT NULL,
+    cached INTEGER NOT NULL DEFAULT 0,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    total_tokens INTEGER,
+    response_time REAL,
+    retries INTEGER,
+    throttle_wait REAL,
+    ttft REAL,
+    itl_p50 REAL,
+    itl_p90 REAL,
+    itl_p99 REAL,
+    decode_tps REAL,
+    sentence_count INTEGER,
+    syllable_count INTEGER,
+    flesch REAL,
+    smog REAL,
+    coleman_liau REAL,
+    gunning_fog REAL,
+    ari REAL,
+    dale_chall REAL,
+    forcast REAL,
+    linsear_write REAL,
+    lix REAL,
+    rix REAL,
+    latency_samples TEXT,
+    response TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_run_provider_model ON results(run_id, provider, model);
+CREATE INDEX IF NOT EXISTS idx_results_provider_model ON results(provider, model);
+"""
+
+_connections = {}
+_db_lock = threading.Lock()
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    # One shared connection per database file; writes are serialized by _db_lock
+    conn = _connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _connections[db_path] = conn
+    return conn
+
+
+def _number(value):
+    """Numeric metric or None ("N/A" and friends are stored as NULL)."""
+    try:
+        return float(value) if value is not None else None
+    except (ValueError, TypeError):
+        return None
+
+
+def start_run(user_question: str = None, config: dict = None, db_path: str = RESULTS_DB) -> str:
+    run_id = f"{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    with _db_lock:
+        conn = _connect(db_path)
+        conn.execute(
+            "INSERT INTO runs (run_id, started_at, user_question, config) VALUES (?, ?, ?, ?)",
+            (run_id, time.time(), user_question, json.dumps(config or {}))
+        )
+        conn.commit()
+    return run_id
+
+
+def record_result(run_id: str, result: dict, question: str = None, db_path: str = RESULTS_DB):
+    """Append one evaluation record (the dict built by run_comparative_evaluation)."""
+    readability = result.get("readability") or {}
+    stream_metrics = result.get("stream_metrics") or {}
+    known = {
+        "provider", "model", "prompt_name", "prompt_type", "prompt_length_words", "input_tokens",
+        "output_tokens", "total_tokens", "response", "response_time", "length", "readability",
+        "stream_metrics", "latency_samples", "latency_stats", "retries", "throttle_wait", "cached",
+        "run_id", "success",
+    }
+    extra = {k: v for k, v in result.items() if k not in known}
+
+    row = {
+        "run_id": run_id,
+        "created_at": time.time(),
+        "provider": result.get("provider"),
+        "model": result.get("model"),
+        "prompt_name": result.get("prompt_name"),
+        "prompt_type": result.get("prompt_type"),
+        "prompt_length_words": result.get("prompt_length_words"),
+        "question": question,
+        "success": int(result.get("success", result.get("response_time") is not None)),
+        "cached": int(bool(result.get("cached"))),
+        "input_tokens": result.get("input_tokens"),
+        "output_tokens": result.get("output_tokens"),
+        "total_tokens": result.get("total_tokens"),
+        "response_time": _number(result.get("response_time")),
+        "retries": result.get("retries", 0),
+        "throttle_wait": _number(result.get("throttle_wait")),
+        "ttft": _number(stream_metrics.get("ttft")),
+        "itl_p50": _number(stream_metrics.get("itl_p50")),
+        "itl_p90": _number(stream_metrics.get("itl_p90")),
+        "itl_p99": _number(stream_metrics.get("itl_p99")),
+        "decode_tps": _number(stream_metrics.get("decode_tokens_per_sec")),
+        "sentence_count": readability.get("sentence_count"),
+        "syllable_count": readability.get("syllable_count"),
+        "latency_samples": json.dumps(result.get("latency_samples") or []),
+        "response": result.get("response"),
+        "extra": json.dumps(extra, default=str),
+    }
+    for key, column in READABILITY_COLUMNS.items():
+        row[column] = _number(readability.get(key))
+
+    columns = ", ".join(row)
+    placeholders = ", ".join("?" for _ in row)
+    with _db_lock:
+        conn = _connect(db_path)
+        conn.execute(f"INSERT INTO results ({columns}) VALUES ({placeholders})", tuple(row.values()))
+        conn.commit()
+
+
+def _to_summary(row: sqlite3.Row) -> dict:
+    # Same keys as report_generator.extract_log_metrics, so generate_report accepts either
+    samples = json.loads(row["latency_samples"] or "[]")
+    extra = json.loads(row["extra"] or "{}")
+    return {
+        "run_id": row["run_id"],
+        "provider": row["provider"].upper(),
+        "model": row["model"],
+        "prompt": row["prompt_name"],
+        "prompt_type": row["prompt_type"],
+        "input_tokens": row["input_tokens"],
+        "output_tokens": row["output_tokens"],
+        "total_tokens": row["total_tokens"],
+        "token_source": extra.get("token_source", "local"),
+        "response_time": row["response_time"],
+        "flesch_score": row["flesch"],
+        "smog_index": row["smog"],
+        "coleman_liau_index": row["coleman_liau"],
+        "gunning_fog_index": row["gunning_fog"],
+        "ari_index": row["ari"],
+        "dale_chall": row["dale_chall"],
+        "forcast": row["forcast"],
+        "linsear_write": row["linsear_write"],
+        "lix": row["lix"],
+        "rix": row["rix"],
+        "ttft": row["ttft"],
+        "itl_p50": row["itl_p50"],
+        "decode_tps": row["decode_tps"],
+        "latency_samples": samples or [row["response_time"]],
+        "retries": row["retries"] or 0,
+        "throttle_wait": row["throttle_wait"] or 0.0,
+        "load_time": extra.get("load_time"),
+        "prompt_eval_time": extra.get("prompt_eval_time"),
+        "eval_time": extra.get("eval_time"),
+        "output_tps": extra.get("output_tokens_per_sec"),
+        "prompt_tps": extra.get("prompt_tokens_per_sec"),
+        "throughput_basis": extra.get("throughput_basis"),
+    }
+
+
+def _where(run_id: str, provider: str, model: str, include_failed: bool):
+    clauses, params = [], []
+    if run_id is not None:
+        clauses.append("run_id = ?")
+        params.append(run_id)
+    if provider is not None:
+        clauses.append("provider = ?")
+        params.append(provider.lower())
+    if model is not None:
+        clauses.append("model = ?")
+        params.append(model)
+    if not include_failed:
+        clauses.append("success = 1")
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def fetch_records(run_id: str = None, provider: str = None, model: str = None,
+                  include_failed: bool = True, db_path: str = RESULTS_DB) -> list:
+    """Raw stored rows (all columns, JSON fields decoded) filtered by run / provider / model."""
+    where, params = _where(run_id, provider, model, include_failed)
+    with _db_lock:
+        conn = _connect(db_path)
+        rows = conn.execute(f"SELECT * FROM results {where} ORDER BY id", params).fetchall()
+
+    records = []
+    for row in rows:
+        record = dict(row)
+        record["success"] = bool(record["success"])
+        record["cached"] = bool(record["cached"])
+        record["latency_samples"] = json.loads(record["latency_samples"] or "[]")
+        record["extra"] = json.loads(record["extra"] or "{}")
+        records.append(record)
+    return records
+
+
+def fetch_results(run_id: str = None, provider: str = None, model: str = None,
+                  include_failed: bool = False, db_path: str = RESULTS_DB) -> list:
+    """Report summary records filtered by run / provider / model (all indexed), in insertion order."""
+    where, params = _where(run_id, provider, model, include_failed)
+    with _db_lock:
+        conn = _connect(db_path)
+        rows = conn.execute(f"SELECT * FROM results {where} ORDER BY id", params).fetchall()
+    return [_to_summary(row) for row in rows]
+
+
+def run_totals(run_id: str, provider: str = None, model: str = None, db_path: str = RESULTS_DB) -> dict:
+    """Test counts, average response time and fastest successful provider/model of a run (optionally one provider/model)."""
+    where, params = _where(run_id, provider, model, include_failed=True)
+    successful_where, successful_params = _where(run_id, provider, model, include_failed=False)
+    with _db_lock:
+        conn = _connect(db_path)
+        totals = conn.execute(
+            "SELECT COUNT(*) AS total, SUM(success) AS successful, "
+            f"AVG(CASE WHEN success = 1 THEN response_time END) AS avg_time FROM results {where}", params
+        ).fetchone()
+        fastest = conn.execute(
+            f"SELECT provider, model FROM results {successful_where} ORDER BY response_time LIMIT 1", successful_params
+        ).fetchone()
+    return {
+        "total_tests": totals["total"] or 0,
+        "successful_tests": totals["successful"] or 0,
+        # Failed calls have no meaningful response time, so they are left out of the average
+        "avg_response_time": round(totals["avg_time"], 2) if totals["avg_time"] is not None else 0,
+        "best_performer": f"{fastest['provider']}-{fastest['model']}" if fastest else "None",
+    }
+
+
+def latest_run_id(db_path: str = RESULTS_DB) -> str | None:
+    with _db_lock:
+        conn = _connect(db_path)
+        row = conn.execute("SELECT run_id FROM runs ORDER BY started_at DESC LIMIT 1").fetchone()
+    return row["run_id"] if row else None
+
+
+def get_run(run_id: str, db_path: str = RESULTS_DB) -> dict | None:
+    with _db_lock:
+        conn = _connect(db_path)
+        row = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+    if row is None:
+        return None
+    return {"run_id": row["run_id"], "started_at": row["started_at"],
+            "user_question": row["user_question"], "config": json.loads(row["config"] or "{}")}
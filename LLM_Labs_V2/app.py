@@ -1,69 +1,50 @@
 import subprocess
-from utils.llms import query_groq_llm, query_gemini_llm, query_ollama_llm
-from utils.prompts import (
-    zero_shot_prompt, one_shot_prompt, few_shot_prompt,
-    chain_of_thought_prompt, react_prompt, self_ask_prompt,
-    tree_of_thought_prompt, instruction_constraints_prompt,
-    persona_based_prompt_template, custom_prompt
-)
+from utils.llms import query_groq_llm, query_gemini_llm, query_ollama_llm, query_mock_llm, MOCK_LLM_HOST
+from utils.prompts import PROMPT_TEMPLATES, build_prompt, custom_prompt
 from utils.comparison import run_comparative_evaluation
-from utils.report_generator import extract_log_metrics, generate_report
+from utils.report_generator import load_run_metrics, generate_report
+from utils.response_cache import CACHE_MODES
+from batch_eval import run_batch
 
 from rag_components.doc_loader import load_document
 from rag_components import chunker
-from rag_components.embedding_model import AVAILABLE_MODELS, embed_chunks, compare_embeddings
+from rag_components.embedding_model import get_available_models, embed_chunks, compare_embeddings
+
+CUSTOM_PROMPT_KEY = "10"
 
 def select_prompt_templates():
     print("\nChoose Prompting Strategies (comma-separated numbers):")
-    prompt_mapping = {
-        "1": zero_shot_prompt,
-        "2": one_shot_prompt,
-        "3": few_shot_prompt,
-        "4": chain_of_thought_prompt,
-        "5": react_prompt,
-        "6": self_ask_prompt,
-        "7": tree_of_thought_prompt,
-        "8": instruction_constraints_prompt,
-        "9": persona_based_prompt_template,
-        "10": custom_prompt
-    }
-    for key, fn in prompt_mapping.items():
-        # nicer display for persona and custom
-        if key == "9":
-            label = "Persona-based Prompt (dynamic)"
-        elif key == "10":
-            label = "Custom Prompt (type your own)"
-        else:
-            label = fn.__name__.replace('_', ' ').title()
+    for key, entry in PROMPT_TEMPLATES.items():
+        # nicer display for persona
+        label = "Persona-based Prompt (dynamic)" if entry["text"] is None else entry["label"]
         print(f"{key}. {label}")
+    print(f"{CUSTOM_PROMPT_KEY}. Custom Prompt (type your own)")
 
     choices = input("Enter prompt numbers (e.g., 1,3,6): ").strip().split(',')
     prompt_templates = {}
 
     for choice in choices:
         choice = choice.strip()
-        if choice == "9":
-            role = input("Enter persona role (e.g., detective): ").strip()
-            tone = input("Enter tone (e.g., friendly, serious): ").strip()
-            style = input("Enter style (e.g., concise, detailed): ").strip()
-            prompt_templates[f"persona_{role}_{tone}_{style}"] = persona_based_prompt_template(role, tone, style)
-        elif choice == "10":
+        if choice == CUSTOM_PROMPT_KEY:
             # interactive custom prompt entry
             print("Type your custom prompt. When finished, type a new line containing only: END")
             cp = custom_prompt()  # interactive mode
             # use sequential key (or let user supply a name if you prefer)
             prompt_templates[f"custom_prompt_{len(prompt_templates)+1}"] = cp
-        elif choice in prompt_mapping:
-            fn = prompt_mapping[choice]
-            # persona and custom were handled above; others are zero-arg functions
-            prompt_templates[fn.__name__] = fn()
+        elif choice in PROMPT_TEMPLATES:
+            if PROMPT_TEMPLATES[choice]["text"] is None:
+                role = input("Enter persona role (e.g., detective): ").strip()
+                tone = input("Enter tone (e.g., friendly, serious): ").strip()
+                style = input("Enter style (e.g., concise, detailed): ").strip()
+                entry = build_prompt(choice, role, tone, style)
+            else:
+                entry = build_prompt(choice)
+            prompt_templates[entry["name"]] = entry["text"]
 
     return prompt_templates
 
-def run_comparative():
-    print("\n🔍 Comparative LLM Evaluation")
-
-    print("\nSelect LLM Providers (comma-separated numbers):\n1. Groq\n2. Gemini\n3. Ollama")
+def select_providers_models() -> dict:
+    print("\nSelect LLM Providers (comma-separated numbers):\n1. Groq\n2. Gemini\n3. Ollama\n4. Mock (local stand-in server)")
     selected = input("Enter your choices (e.g., 1,3): ").strip().split(',')
     provider_models = {}
 
@@ -87,23 +68,50 @@ def run_comparative():
                     print("⚠️ Failed to list local models.")
             models = input("Enter Ollama model names (comma-separated): ").strip().split(',')
             provider_models["ollama"] = [m.strip() for m in models]
+        elif choice == "4":
+            print(f"\n🧪 Mock server expected at {MOCK_LLM_HOST} (start it with: python -m utils.mock_llm_server)")
+            models = input("Enter mock model names (comma-separated, any label): ").strip().split(',')
+            provider_models["mock"] = [m.strip() for m in models]
 
+    return provider_models
+
+def run_comparative():
+    print("\n🔍 Comparative LLM Evaluation")
+
+    provider_models = select_providers_models()
     prompt_templates = select_prompt_templates()
     user_input = input("\n🧠 Enter your question for comparison: ").strip()
-    run_comparative_evaluation(provider_models, prompt_templates, user_input)
+    concurrent = input("⚡ Run all provider/model/prompt calls concurrently? (y/n): ").strip().lower() == "y"
+    stream = input("🚀 Stream responses to measure time-to-first-token? (y/n): ").strip().lower() == "y"
+    cache_mode = input("💾 Response cache mode (off/use/refresh/replay, default off): ").strip().lower() or "off"
+    if cache_mode not in CACHE_MODES:
+        print("⚠️ Unknown cache mode, caching disabled.")
+        cache_mode = "off"
+    try:
+        warmup = int(input("🔥 Warmup calls per cell, discarded (default 0): ").strip() or 0)
+        trials = int(input("🔁 Measured calls per cell (default 1): ").strip() or 1)
+    except ValueError:
+        print("⚠️ Invalid number, using a single measured call.")
+        warmup, trials = 0, 1
+    results = run_comparative_evaluation(
+        provider_models, prompt_templates, user_input,
+        concurrent=concurrent, stream=stream, cache_mode=cache_mode,
+        warmup=warmup, trials=trials
+    )
+    run_id = next((r["run_id"] for r in results.values()), None)
 
     print("\n📘 Do you want a detailed performance report based on metrics? (y/n)")
     if input().lower() == "y":
         try:
-            summary = extract_log_metrics()
-            report_path = generate_report(summary, user_input)
+            summary = load_run_metrics(run_id)
+            report_path = generate_report(summary, user_input, cache_mode=cache_mode)
             print(f"📥 You can download the report from: {report_path}")
         except Exception as e:
             print(f"⚠️ Report generation failed: {e}")
 
 def run_single_llm_chat():
-    print("\nChoose LLM Provider:\n1. Groq\n2. Gemini\n3. Ollama (local)")
-    provider_choice = input("Enter 1, 2, or 3: ").strip()
+    print("\nChoose LLM Provider:\n1. Groq\n2. Gemini\n3. Ollama (local)\n4. Mock (local stand-in server)")
+    provider_choice = input("Enter 1, 2, 3, or 4: ").strip()
 
     if provider_choice == "1":
         provider = "groq"
@@ -125,6 +133,10 @@ def run_single_llm_chat():
                 print("⚠️ Failed to list local models.")
                 print(e.stderr)
         model = input("Enter model name (e.g., llama3:latest): ").strip()
+    elif provider_choice == "4":
+        provider = "mock"
+        print(f"\n🧪 Mock server expected at {MOCK_LLM_HOST} (start it with: python -m utils.mock_llm_server)")
+        model = input("Enter any model label (e.g., mock): ").strip() or "mock"
     else:
         raise ValueError("❌ Invalid provider selection.")
 
@@ -147,6 +159,8 @@ def run_single_llm_chat():
             response = query_gemini_llm(model=model, user_input=question, prompt=prompt_template)
         elif provider == "ollama":
             response = query_ollama_llm(model=model, user_input=question, prompt=prompt_template)
+        elif provider == "mock":
+            response = query_mock_llm(model=model, user_input=question, prompt=prompt_template)
         else:
             raise ValueError("❌ Unsupported provider.")
 
@@ -201,12 +215,13 @@ def rag_strategy():
 
     # 🔹 Ask user for embedding model
     print("\n🔹 Available Embedding Models:")
-    for i, model in enumerate(AVAILABLE_MODELS, 1):
+    available_models = get_available_models()
+    for i, model in enumerate(available_models, 1):
         print(f"{i}. {model}")
 
     try:
         model_choice = int(input("\n👉 Select embedding model (enter number): ").strip())
-        model_name = AVAILABLE_MODELS[model_choice - 1]
+        model_name = available_models[model_choice - 1]
     except (ValueError, IndexError):
         print("⚠️ Invalid model choice, using default (all-MiniLM-L6-v2).")
         model_name = "sentence-transformers/all-MiniLM-L6-v2"
@@ -233,13 +248,36 @@ def rag_strategy():
 
     return results
 
+def run_batch_evaluation():
+    print("\n🗂️ Batch Evaluation over a Question Dataset")
+    dataset_path = input("Enter dataset path (.jsonl or .csv with a 'question' field): ").strip()
+    provider_models = select_providers_models()
+    prompt_templates = select_prompt_templates()
+    results_path = input("Results file (default batch_results.jsonl, re-use it to resume): ").strip() or "batch_results.jsonl"
+    concurrent = input("⚡ Run each question's calls concurrently? (y/n): ").strip().lower() == "y"
+
+    try:
+        state = run_batch(dataset_path, provider_models, prompt_templates, results_path=results_path, concurrent=concurrent)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Batch evaluation failed: {e}")
+        return
+
+    if input("\n📘 Generate a performance report for the whole batch? (y/n): ").strip().lower() == "y":
+        try:
+            summary = load_run_metrics(state["run_id"])
+            report_path = generate_report(summary, f"Batch over {dataset_path}")
+            print(f"📥 You can download the report from: {report_path}")
+        except Exception as e:
+            print(f"⚠️ Report generation failed: {e}")
+
 def main():
     print("\nChoose Mode:")
     print("1. Single LLM Chat")
     print("2. Comparative Evaluation (Multiple Providers)")
     print("3. RAG Implementation")
+    print("4. Batch Evaluation (JSONL/CSV dataset, resumable)")
 
-    mode = input("Enter 1, 2, or 3: ").strip()
+    mode = input("Enter 1, 2, 3, or 4: ").strip()
 
     if mode == "1":
         run_single_llm_chat()
@@ -247,6 +285,8 @@ def main():
         run_comparative()
     elif mode == "3":
         rag_strategy()
+    elif mode == "4":
+        run_batch_evaluation()
     else:
         print("❌ Invalid mode selection.")
 
@@ -0,0 +1,242 @@
+"""
+Headless batch evaluation: run the provider x model x prompt matrix for every
+question in a JSONL or CSV dataset.
+
+Each finished cell is appended to a JSONL results file as soon as it completes,
+and that file doubles as the checkpoint: re-running the same command skips every
+cell already recorded successfully and retries the rest.
+
+    python batch_eval.py questions.jsonl --provider groq=llama3-8b-8192,llama3-70b-8192 \\
+        --provider ollama=llama3:latest --prompts zero_shot_prompt,chain_of_thought_prompt \\
+        --output batch_results.jsonl --concurrent
+"""
+import os
+import csv
+import json
+import time
+import argparse
+import logging
+
+from utils.prompts import TEMPLATES_BY_NAME
+from utils.comparison import preload_local_models, run_comparative_evaluation
+from utils.response_cache import CACHE_MODES
+from utils.results_store import start_run
+from utils.deadlines import DEFAULT_CALL_TIMEOUT_SECONDS
+from utils.llms import OLLAMA_KEEP_ALIVE
+from comparision_tools.prompt_classifier import CLASSIFIER_MODES
+
+QUESTION_FIELDS = ("question", "prompt", "input", "text")
+
+
+def load_questions(path: str) -> list:
+    """Read `{"id", "question"}` records from a .jsonl or .csv file. Ids default to the 1-based row number."""
+    ext = os.path.splitext(path)[-1].lower()
+    questions = []
+
+    if ext in (".jsonl", ".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            rows = [(i, json.loads(line)) for i, line in enumerate(f, 1) if line.strip()]
+    elif ext == ".csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            rows = list(enumerate(csv.DictReader(f), 1))
+    else:
+        raise ValueError(f"Unsupported dataset format: {ext} (use .jsonl or .csv)")
+
+    for row_number, row in rows:
+        if isinstance(row, str):
+            row = {"question": row}
+        text = next((row[field] for field in QUESTION_FIELDS if row.get(field)), None)
+        if not text:
+            logging.warning(f"Skipping dataset row {row_number}: no question field")
+            continue
+        questions.append({"id": str(row.get("id") or row_number), "question": str(text).strip()})
+    return questions
+
+
+def load_completed(results_path: str) -> dict:
+    """Map question id -> cell keys already recorded successfully in the results file."""
+    completed = {}
+    if not os.path.exists(results_path):
+        return completed
+
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash; that cell is simply re-run
+            if not isinstance(record, dict) or "question_id" not in record or "cell_key" not in record:
+                continue  # not a result record
+            if record.get("response_time") is None:
+                continue  # failed cells are retried on resume
+            completed.setdefault(record["question_id"], set()).add(record["cell_key"])
+    return completed
+
+
+def _write_checkpoint(path: str, state: dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_batch(dataset_path: str, providers_models: dict, prompts: dict,
+              results_path: str = "batch_results.jsonl", **eval_kwargs) -> dict:
+    """
+    Evaluate every dataset question, streaming results to `results_path` and
+    resuming from it. `eval_kwargs` are passed to run_comparative_evaluation.
+    The whole batch is one run in utils.results_store; a resumed batch keeps its run id.
+    Local models are preloaded once, before the first question that still has cells to run.
+    Returns a small progress summary.
+    """
+    questions = load_questions(dataset_path)
+    completed = load_completed(results_path)
+    checkpoint_path = results_path + ".checkpoint.json"
+    cells_per_question = sum(len(models) for models in providers_models.values()) * len(prompts)
+    preload = eval_kwargs.pop("preload", True) and eval_kwargs.get("cache_mode", "off") != "replay"
+
+    # A crash can leave the last line without its newline; never glue onto it
+    if os.path.exists(results_path) and os.path.getsize(results_path) > 0:
+        with open(results_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+    else:
+        needs_newline = False
+
+    run_id = None
+    if os.path.exists(checkpoint_path):
+        try:
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                run_id = json.load(f).get("run_id")
+        except (OSError, json.JSONDecodeError):
+            run_id = None
+    if run_id is None:
+        run_id = start_run(f"batch:{dataset_path}", {"providers_models": providers_models, "prompts": list(prompts)})
+
+    state = {"dataset": dataset_path, "results": results_path, "run_id": run_id, "total_questions": len(questions),
+             "questions_done": 0, "cells_written": 0, "cells_failed": 0, "last_question_id": None}
+    start = time.perf_counter()
+
+    with open(results_path, "a", encoding="utf-8") as out:
+        if needs_newline:
+            out.write("\n")
+
+        for position, item in enumerate(questions, 1):
+            question_id = item["id"]
+            done = completed.get(question_id, set())
+            if len(done) >= cells_per_question:
+                state["questions_done"] += 1
+                continue
+
+            def on_result(key, result, question_id=question_id, question=item["question"]):
+                record = {"question_id": question_id, "question": question, "cell_key": key, **result}
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                os.fsync(out.fileno())
+                state["cells_written"] += 1
+                if result.get("response_time") is None:
+                    state["cells_failed"] += 1
+
+            print(f"🧪 [{position}/{len(questions)}] Question {question_id} ({cells_per_question - len(done)} cells left)")
+            if preload:
+                preload_local_models(
+                    providers_models,
+                    eval_kwargs.get("keep_alive", OLLAMA_KEEP_ALIVE),
+                    eval_kwargs.get("call_timeout", DEFAULT_CALL_TIMEOUT_SECONDS)
+                )
+                preload = False
+            run_comparative_evaluation(
+                providers_models, prompts, item["question"], on_result=on_result, skip_cells=done,
+                print_results=False, run_id=run_id, preload=False, **eval_kwargs
+            )
+
+            state["questions_done"] += 1
+            state["last_question_id"] = question_id
+            state["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            _write_checkpoint(checkpoint_path, state)
+
+    state["elapsed_seconds"] = round(time.perf_counter() - start, 2)
+    _write_checkpoint(checkpoint_path, state)
+    print(
+        f"\n✅ Batch finished: {state['questions_done']}/{state['total_questions']} questions, "
+        f"{state['cells_written']} cells written ({state['cells_failed']} failed) in {state['elapsed_seconds']}s."
+    )
+    print(f"📄 Results: {results_path} (run {run_id} in the results store)")
+    return state
+
+
+def _parse_providers(specs: list) -> dict:
+    providers_models = {}
+    for spec in specs:
+        provider, _, models = spec.partition("=")
+        if not models:
+            raise ValueError(f"Invalid --provider value '{spec}', expected provider=model1,model2")
+        providers_models.setdefault(provider.strip().lower(), []).extend(
+            m.strip() for m in models.split(",") if m.strip()
+        )
+    return providers_models
+
+
+def _build_prompts(names: str) -> dict:
+    templates = {}
+    for name in (n.strip() for n in names.split(",")):
+        entry = TEMPLATES_BY_NAME.get(name)
+        if entry is None or entry["text"] is None:
+            raise ValueError(f"Unknown or non-static prompt template: {name}")
+        templates[name] = entry["text"]
+    return templates
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch LLM comparison over a JSONL/CSV question dataset")
+    parser.add_argument("dataset", help="Path to a .jsonl or .csv file with a 'question' field")
+    parser.add_argument("--provider", action="append", required=True,
+                        help="provider=model1,model2 (repeatable), e.g. groq=llama3-8b-8192")
+    parser.add_argument("--prompts", default="zero_shot_prompt",
+                        help="Comma-separated prompt functions from utils/prompts.py")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL results file (also the checkpoint)")
+    parser.add_argument("--concurrent", action="store_true", help="Dispatch each question's matrix concurrently")
+    parser.add_argument("--stream", action="store_true", help="Use streaming calls and record TTFT")
+    parser.add_argument("--cache", choices=CACHE_MODES, default="off", help="Response cache mode")
+    parser.add_argument("--warmup", type=int, default=0)
+    parser.add_argument("--trials", type=int, default=1)
+    parser.add_argument("--call-timeout", type=float, default=DEFAULT_CALL_TIMEOUT_SECONDS,
+                        help="Seconds before a single provider call is abandoned")
+    parser.add_argument("--question-deadline", type=float, default=None,
+                        help="Seconds each question's whole matrix may take")
+    parser.add_argument("--hedge-percentile", type=float, default=None,
+                        help="Hedge calls slower than this latency percentile, e.g. 95")
+    parser.add_argument("--keep-alive", default=OLLAMA_KEEP_ALIVE,
+                        help="How long Ollama keeps models loaded, e.g. 10m or -1")
+    parser.add_argument("--no-preload", action="store_true", help="Skip loading Ollama models before measuring")
+    parser.add_argument("--metrics-workers", type=int, default=None,
+                        help="Processes scoring responses in the background (0 = score inline)")
+    parser.add_argument("--batch-scoring", action="store_true", default=None,
+                        help="Score each question's responses together in one nlp.pipe pass (default with --cache replay)")
+    parser.add_argument("--prompt-classifier", choices=CLASSIFIER_MODES, default=None,
+                        help="Prompt type classifier (default: PROMPT_CLASSIFIER_MODE or keywords)")
+    args = parser.parse_args()
+
+    run_batch(
+        args.dataset,
+        _parse_providers(args.provider),
+        _build_prompts(args.prompts),
+        results_path=args.output,
+        concurrent=args.concurrent,
+        stream=args.stream,
+        cache_mode=args.cache,
+        warmup=args.warmup,
+        trials=args.trials,
+        metrics_workers=args.metrics_workers,
+        call_timeout=args.call_timeout,
+        run_deadline=args.question_deadline,
+        hedge_percentile=args.hedge_percentile,
+        preload=not args.no_preload,
+        keep_alive=args.keep_alive,
+        batch_scoring=args.batch_scoring,
+        prompt_classifier=args.prompt_classifier,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Throughput of the prompt classifier: the original substring scans against the
+whole-word keyword lookup, one prompt at a time and batched. The original stops at
+the first category with a hit, so it is also timed scoring every category (one
+substring count per keyword), which is what score_prompts returns.
+
+Prompts come from a file (one per line, or a JSON list of strings) or are generated
+from a small vocabulary. Also prints how often the two classifiers disagree, with a
+few examples, since the new one no longer matches inside words.
+
+    python benchmarks/prompt_classifier_bench.py --prompts 20000 --repeat 3
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comparision_tools.prompt_classifier import PROMPT_CATEGORIES, classify_prompt, classify_prompts, score_prompts
+
+DEFAULT_PROMPTS = 20_000
+DEFAULT_REPEAT = 3
+
+_VOCABULARY = (
+    "please show me how to solve this equation explain why the sky is blue write a short story "
+    "about a dragon who lives in the mountains describe the history of mathematics define entropy "
+    "what is the capital of france calculate the area of a circle imagine a world without rain "
+    "analyze the reasons for the fall of rome summarize this article translate it into german "
+    "list three poems somehow whatever whoever reasonable showcase proverb"
+).split()
+
+
+def legacy_classify_prompt(prompt: str) -> str:
+    """The classifier before whole-word matching, kept here as the baseline."""
+    prompt = prompt.lower()
+    if any(word in prompt for word in ["prove", "solve", "equation", "math", "calculate"]):
+        return "Math"
+    elif any(word in prompt for word in ["story", "poem", "imagine", "creative"]):
+        return "Creative"
+    elif any(word in prompt for word in ["why", "how", "explain", "analyze", "reason"]):
+        return "Reasoning"
+    elif any(word in prompt for word in ["when", "where", "what", "who", "define", "describe"]):
+        return "Knowledge"
+    else:
+        return "General"
+
+
+def legacy_score_prompt(prompt: str) -> dict:
+    """Substring hits per category, the original matching extended to every category."""
+    prompt = prompt.lower()
+    return {category: sum(prompt.count(word) for word in words) for category, words in PROMPT_CATEGORIES.items()}
+
+
+def load_prompts(path: str = None, count: int = DEFAULT_PROMPTS, seed: int = 0) -> list:
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        try:
+            return [str(p) for p in json.loads(text)]
+        except json.JSONDecodeError:
+            return [line for line in text.splitlines() if line.strip()]
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(_VOCABULARY, k=rng.randint(4, 40))).capitalize() + "?" for _ in range(count)]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the prompt classifier against the original")
+    parser.add_argument("--file", help="Prompts to classify (one per line or a JSON list)")
+    parser.add_argument("--prompts", type=int, default=DEFAULT_PROMPTS, help="Generated prompts when no --file")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Best of this many runs is reported")
+    args = parser.parse_args()
+
+    prompts = load_prompts(args.file, args.prompts)
+    timings = {
+        "original (per prompt)": _best_of(lambda: [legacy_classify_prompt(p) for p in prompts], args.repeat),
+        "word lookup (per prompt)": _best_of(lambda: [classify_prompt(p) for p in prompts], args.repeat),
+        "word lookup (batch)": _best_of(lambda: classify_prompts(prompts), args.repeat),
+        "original, all category scores": _best_of(lambda: [legacy_score_prompt(p) for p in prompts], args.repeat),
+        "word lookup, all category scores": _best_of(lambda: score_prompts(prompts), args.repeat),
+    }
+    baseline = timings["original (per prompt)"]
+    print(f"🧪 {len(prompts)} prompts, best of {args.repeat}")
+    for name, seconds in timings.items():
+        print(f"⏱️ {name}: {seconds:.4f}s | {len(prompts) / seconds:,.0f} prompts/s | {baseline / seconds:.2f}x")
+
+    old_labels = [legacy_classify_prompt(p) for p in prompts]
+    new_labels = classify_prompts(prompts)
+    changed = [(p, old, new) for p, old, new in zip(prompts, old_labels, new_labels) if old != new]
+    print(f"🔀 Labels changed for {len(changed)} of {len(prompts)} prompts (whole-word matching)")
+    for prompt, old, new in changed[:5]:
+        print(f"   {old} -> {new}: {prompt[:80]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
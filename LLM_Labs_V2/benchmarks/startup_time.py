@@ -0,0 +1,92 @@
+"""
+Cold-start budget for app.py: how long `import app` takes in a fresh interpreter,
+i.e. the time before the mode menu can appear.
+
+Each run is a new process started from an empty working directory. The check fails
+(exit code 1) when the median start-up exceeds the budget, or when importing the app
+pulled in a heavy dependency that should only load in the mode that needs it.
+
+    python benchmarks/startup_time.py --budget 1.5 --runs 5
+"""
+import os
+import sys
+import json
+import argparse
+import time
+import statistics
+import subprocess
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_SECONDS = 1.5
+DEFAULT_RUNS = 5
+
+# Must not be imported just to show the menu
+HEAVY_MODULES = (
+    "spacy", "textstat", "transformers", "torch", "tiktoken", "numpy", "pandas", "sklearn",
+    "langchain", "langchain_community", "langchain_huggingface", "huggingface_hub",
+    "groq", "google.generativeai", "ollama", "httpx",
+)
+
+_PROBE = (
+    "import sys, json, time\n"
+    "start = time.perf_counter()\n"
+    "import app\n"
+    "elapsed = time.perf_counter() - start\n"
+    f"heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+    "print(json.dumps({'import_seconds': elapsed, 'heavy': heavy}))\n"
+)
+
+
+def measure_startup(runs: int = DEFAULT_RUNS) -> dict:
+    """Start-up of `runs` fresh interpreters: total wall time, app import time and heavy modules loaded."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [APP_DIR, os.getenv("PYTHONPATH")]))}
+    wall, imports, heavy = [], [], set()
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(runs):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-c", _PROBE], cwd=workdir, env=env, capture_output=True, text=True
+            )
+            wall.append(time.perf_counter() - start)
+            if completed.returncode != 0:
+                raise RuntimeError(f"importing app failed:\n{completed.stderr.strip()}")
+            probe = json.loads(completed.stdout.strip().splitlines()[-1])
+            imports.append(probe["import_seconds"])
+            heavy.update(probe["heavy"])
+    return {
+        "runs": runs,
+        "wall_median": statistics.median(wall),
+        "wall_min": min(wall),
+        "import_median": statistics.median(imports),
+        "heavy_modules": sorted(heavy),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Fail if app.py's cold start exceeds a time budget")
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", DEFAULT_BUDGET_SECONDS)),
+                        help="Maximum median seconds from interpreter launch to app imported")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    args = parser.parse_args()
+
+    result = measure_startup(args.runs)
+    print(
+        f"⏱️ Cold start over {result['runs']} runs - median: {result['wall_median']:.3f}s | "
+        f"best: {result['wall_min']:.3f}s | import app: {result['import_median']:.3f}s | budget: {args.budget:.3f}s"
+    )
+    failed = False
+    if result["heavy_modules"]:
+        print(f"❌ Heavy modules imported at start-up: {', '.join(result['heavy_modules'])}")
+        failed = True
+    if result["wall_median"] > args.budget:
+        print(f"❌ Start-up exceeds the budget by {result['wall_median'] - args.budget:.3f}s")
+        failed = True
+    if not failed:
+        print("✅ Start-up within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+# Nearest-centroid prompt categories: prompts are embedded with a sentence-transformer
+# (rag_components.embedding_model) and take the category whose centroid - the mean of
+# its example prompts' embeddings - has the highest cosine similarity. Centroids are
+# stored as a float32 .npy matrix (one unit-length row per category, in CATEGORY_EXAMPLES
+# order), named after the model and a hash of the examples, so editing either rebuilds it.
+# numpy and the embedding model load on first use.
+PROMPT_EMBEDDING_MODEL = os.getenv("PROMPT_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+PROMPT_CENTROIDS_DIR = os.getenv("PROMPT_CENTROIDS_DIR", "prompt_centroids")
+PROMPT_EMBEDDING_CACHE_SIZE = 10_000
+
+CATEGORY_EXAMPLES = {
+    "Math": [
+        "Solve for x: 3x + 7 = 22.",
+        "Prove that the square root of 2 is irrational.",
+        "Calculate the derivative of x^3 * sin(x).",
+        "What is the probability of rolling two sixes with two dice?",
+        "Find the area of a triangle with sides 5, 12 and 13.",
+        "Simplify the fraction 84/126 and show the steps.",
+    ],
+    "Creative": [
+        "Write a short story about a robot who learns to paint.",
+        "Compose a poem about the ocean at night.",
+        "Imagine a city floating above the clouds and describe daily life there.",
+        "Write a song chorus about leaving home.",
+        "Invent a fairy tale with a clever fox as the hero.",
+        "Write a dialogue between two rival chefs.",
+    ],
+    "Reasoning": [
+        "Explain why the sky is blue.",
+        "Why do prices rise when interest rates are low?",
+        "Analyze the pros and cons of remote work.",
+        "How does a vaccine train the immune system?",
+        "Compare the arguments for and against nuclear power.",
+        "If all cats are mammals and some mammals fly, can we conclude some cats fly?",
+    ],
+    "Knowledge": [
+        "Who wrote Pride and Prejudice?",
+        "When did the Second World War end?",
+        "What is the capital of Australia?",
+        "Define photosynthesis.",
+        "Describe the structure of a human cell.",
+        "Where is the Great Barrier Reef located?",
+    ],
+    "General": [
+        "Hello, how are you today?",
+        "Summarize this paragraph in one sentence.",
+        "Translate 'good morning' into Spanish.",
+        "Give me three tips for a productive morning.",
+        "Rewrite this email to sound more polite.",
+        "Recommend a good book for a long flight.",
+    ],
+}
+
+_embedders = {}
+_centroids = {}
+_prompt_embeddings = OrderedDict()  # (model, prompt) -> unit-length float32 vector
+_lock = threading.Lock()
+
+
+def _normalize(vectors):
+    import numpy as np
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _get_embedder(model_name: str):
+    with _lock:
+        if model_name not in _embedders:
+            from rag_components.embedding_model import get_huggingface_embeddings
+            embedder = get_huggingface_embeddings(model_name)
+            if embedder is None:
+                raise RuntimeError(f"embedding model {model_name} unavailable")
+            _embedders[model_name] = embedder
+        return _embedders[model_name]
+
+
+def centroids_path(model_name: str = PROMPT_EMBEDDING_MODEL) -> str:
+    # e.g. prompt_centroids/sentence-transformers_all-MiniLM-L6-v2-<hash>.npy
+    digest = hashlib.sha256(json.dumps([model_name, CATEGORY_EXAMPLES], sort_keys=True).encode("utf-8")).hexdigest()
+    slug = re.sub(r"[^\w.-]+", "_", model_name)
+    return os.path.join(PROMPT_CENTROIDS_DIR, f"{slug}-{digest[:12]}.npy")
+
+
+def build_category_centroids(model_name: str = PROMPT_EMBEDDING_MODEL, path: str = None) -> str:
+    """Embed CATEGORY_EXAMPLES in one batch and save the per-category centroids; returns the file path."""
+    import numpy as np
+    path = path or centroids_path(model_name)
+    examples = [text for texts in CATEGORY_EXAMPLES.values() for text in texts]
+    vectors = _normalize(_get_embedder(model_name).embed_documents(examples))
+    bounds = np.cumsum([0] + [len(texts) for texts in CATEGORY_EXAMPLES.values()])
+    centroids = _normalize([vectors[start:end].mean(axis=0) for start, end in zip(bounds[:-1], bounds[1:])])
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, centroids)
+    os.replace(tmp_path, path)
+    logging.info(f"Saved {len(centroids)} prompt-category centroids for {model_name} to {path}")
+    return path
+
+
+def load_category_centroids(model_name: str = PROMPT_EMBEDDING_MODEL):
+    """(len(CATEGORY_EXAMPLES), dim) float32 centroid matrix, built and saved on first use."""
+    import numpy as np
+    centroids = _centroids.get(model_name)
+    if centroids is None:
+        path = centroids_path(model_name)
+        if not os.path.exists(path):
+            build_category_centroids(model_name, path)
+        centroids = np.load(path).astype(np.float32, copy=False)
+        _centroids[model_name] = centroids
+    return centroids
+
+
+def embed_prompts(prompts: list, model_name: str = PROMPT_EMBEDDING_MODEL):
+    """
+    Unit-length float32 embeddings, one row per prompt. Prompts embedded before are
+    served from an in-memory LRU cache; the rest (deduplicated) go through one batched encode.
+    """
+    import numpy as np
+    if not prompts:
+        return np.zeros((0, load_category_centroids(model_name).shape[1]), dtype=np.float32)
+    vectors = {}
+    with _lock:
+        for prompt in dict.fromkeys(prompts):
+            key = (model_name, prompt)
+            if key in _prompt_embeddings:
+                _prompt_embeddings.move_to_end(key)
+                vectors[prompt] = _prompt_embeddings[key]
+    missing = [prompt for prompt in dict.fromkeys(prompts) if prompt not in vectors]
+    if missing:
+        encoded = _normalize(_get_embedder(model_name).embed_documents(missing))
+        vectors.update(zip(missing, encoded))
+        with _lock:
+            for prompt, vector in zip(missing, encoded):
+                _prompt_embeddings[(model_name, prompt)] = vector
+            while len(_prompt_embeddings) > PROMPT_EMBEDDING_CACHE_SIZE:
+                _prompt_embeddings.popitem(last=False)
+    return np.stack([vectors[prompt] for prompt in prompts])
+
+
+def category_similarities(prompts: list, model_name: str = PROMPT_EMBEDDING_MODEL):
+    """Cosine similarity of every prompt to every category centroid: (len(prompts), categories)."""
+    return embed_prompts(prompts, model_name) @ load_category_centroids(model_name).T
+
+
+def classify_by_embedding(prompts: list, model_name: str = PROMPT_EMBEDDING_MODEL) -> list:
+    """Nearest-centroid category for each prompt."""
+    categories = list(CATEGORY_EXAMPLES)
+    return [categories[i] for i in category_similarities(prompts, model_name).argmax(axis=1)]
@@ -0,0 +1,91 @@
+import math
+import time
+import statistics
+
+# Two-sided 95% Student-t critical values by degrees of freedom; 1.96 beyond the table
+_T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 25: 2.060, 30: 2.042,
+}
+
+
+def percentile(values: list, pct: float) -> float | None:
+    """Linear-interpolated percentile (pct in 0-100) of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (pct / 100) * (len(ordered) - 1)
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def t_critical(df: int) -> float:
+    if df in _T_CRITICAL_95:
+        return _T_CRITICAL_95[df]
+    smaller = [k for k in _T_CRITICAL_95 if k < df]
+    return _T_CRITICAL_95[max(smaller)] if df <= 30 else 1.96
+
+
+def summarize_samples(samples: list) -> dict:
+    """
+    Distribution summary of repeated latency measurements (seconds):
+    n, mean, stddev, p50/p90/p99 and a 95% confidence interval for the mean.
+    """
+    values = [s for s in samples if s is not None]
+    n = len(values)
+    if n == 0:
+        return {"n": 0, "mean": None, "stddev": None, "p50": None, "p90": None, "p99": None,
+                "ci_low": None, "ci_high": None}
+
+    mean = statistics.fmean(values)
+    stddev = statistics.stdev(values) if n > 1 else 0.0
+    margin = t_critical(n - 1) * stddev / math.sqrt(n) if n > 1 else 0.0
+    return {
+        "n": n,
+        "mean": round(mean, 4),
+        "stddev": round(stddev, 4),
+        "p50": round(percentile(values, 50), 4),
+        "p90": round(percentile(values, 90), 4),
+        "p99": round(percentile(values, 99), 4),
+        "ci_low": round(mean - margin, 4),
+        "ci_high": round(mean + margin, 4),
+    }
+
+
+def measure_stream(chunks, on_fragment=None) -> tuple[str, dict]:
+    """
+    Consume a streaming generator and time it, handing each fragment to `on_fragment`
+    as it arrives. That runs inside the timed loop, so it must be cheap - e.g.
+    ReadabilityConsumer.put, which only queues the fragment for a background parser.
+    - Clock starts before the first `next()`, i.e. when the request is sent
+    - `ttft`: seconds until the first non-empty fragment
+    - `itl_*`: inter-token (inter-fragment) latency percentiles in milliseconds
+    - `stream_time`: seconds until the stream is exhausted
+    Returns the joined text and the timing dict.
+    """
+    start = time.perf_counter()
+    parts = []
+    arrivals = []
+    for fragment in chunks:
+        arrivals.append(time.perf_counter())
+        parts.append(fragment)
+        if on_fragment is not None:
+            on_fragment(fragment)
+    end = time.perf_counter()
+
+    gaps = [(b - a) * 1000 for a, b in zip(arrivals, arrivals[1:])]
+    ttft = arrivals[0] - start if arrivals else None
+    timings = {
+        "ttft": round(ttft, 3) if ttft is not None else None,
+        "stream_time": round(end - start, 3),
+        "decode_time": round(end - arrivals[0], 6) if arrivals else None,
+        "chunk_count": len(arrivals),
+        "itl_p50": round(percentile(gaps, 50), 2) if gaps else None,
+        "itl_p90": round(percentile(gaps, 90), 2) if gaps else None,
+        "itl_p99": round(percentile(gaps, 99), 2) if gaps else None,
+    }
+    return "".join(parts).strip(), timings
@@ -1,26 +1,78 @@
-import spacy
+import queue
+import logging
+import threading
+
 import textstat
 
-# Load spaCy NLP model
-nlp = spacy.load("en_core_web_sm")
+from comparision_tools.syllables import syllable_count
+
+# Readability only needs tokens (is_alpha) and sentence boundaries, so the
+# statistical components are left out and the rule-based sentencizer splits sentences
+READABILITY_EXCLUDED_PIPES = ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"]
+READABILITY_BATCH_SIZE = 64
+
+# FORCAST and Linsear Write only look at the start of the text
+FORCAST_SAMPLE_WORDS = 150
+LINSEAR_SAMPLE_WORDS = 100
+
+# ReadabilityAccumulator parses streamed text in pieces of about this many characters
+ACCUMULATOR_CHUNK_CHARS = 2000
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+def get_nlp():
+    """spaCy pipeline for readability, loaded on first use."""
+    global _nlp
+    if _nlp is not None:
+        return _nlp
+    with _nlp_lock:
+        if _nlp is None:
+            import spacy
+            nlp = spacy.load("en_core_web_sm", exclude=READABILITY_EXCLUDED_PIPES)
+            nlp.add_pipe("sentencizer")
+            _nlp = nlp
+        return _nlp
+
+def analyze_text(text: str) -> dict:
+    """
+    Parse `text` once and build the feature table every index is derived from:
+    one (length, syllables, is_difficult) row per alphabetic token, in order, plus
+    the sentence and distinct-difficult-word counts. Syllables (shared, cached
+    comparision_tools.syllables service) and Dale-Chall difficulty are looked up
+    once per distinct word.
+    """
+    return _analyze_doc(get_nlp()(text))
 
-def get_text_stats(text: str) -> dict:
-    doc = nlp(text)
-    sentence_count = len(list(doc.sents))
-    word_count = len([token for token in doc if token.is_alpha])
-    syllable_count = textstat.syllable_count(text)
-    polysyllable_count = 0
-    for token in doc:
-        if token.is_alpha and textstat.syllable_count(token.text) >= 3:
-            polysyllable_count += 1
-    char_count = sum(len(token.text) for token in doc if token.is_alpha)
+def _word_row(word: str, word_features: dict) -> tuple:
+    row = word_features.get(word)
+    if row is None:
+        row = word_features[word] = (len(word), syllable_count(word), textstat.is_difficult_word(word))
+    return row
 
+def _analyze_doc(doc) -> dict:
+    word_features = {}
+    table = [_word_row(token.text, word_features) for token in doc if token.is_alpha]
     return {
-        "sentence_count": sentence_count,
-        "word_count": word_count,
-        "syllable_count": syllable_count,
-        "polysyllable_count": polysyllable_count,
-        "char_count": char_count
+        "sentence_count": sum(1 for _ in doc.sents),
+        "words": table,
+        "difficult_word_count": sum(1 for *_, difficult in word_features.values() if difficult),
+    }
+
+def get_text_stats(features: dict) -> dict:
+    """Counts every index is computed from (the same ones ReadabilityAccumulator keeps running)."""
+    words = features["words"]
+    return {
+        "sentence_count": features["sentence_count"],
+        "word_count": len(words),
+        "syllable_count": sum(syllables for _, syllables, _ in words),
+        "polysyllable_count": sum(1 for _, syllables, _ in words if syllables >= 3),
+        "char_count": sum(length for length, _, _ in words),
+        "long_word_count": sum(1 for length, _, _ in words if length > 6),
+        "difficult_word_count": features["difficult_word_count"],
+        "forcast_monosyllables": sum(1 for _, syllables, _ in words[:FORCAST_SAMPLE_WORDS] if syllables == 1),
+        "linsear_easy": sum(1 for _, syllables, _ in words[:LINSEAR_SAMPLE_WORDS] if syllables <= 2),
+        "linsear_hard": sum(1 for _, syllables, _ in words[:LINSEAR_SAMPLE_WORDS] if syllables >= 3),
     }
 
 def compute_flesch_reading_ease(sentence_count: int, word_count: int, syllable_count: int) -> float | str:
@@ -74,23 +126,24 @@ def compute_automated_readability_index(char_count: int, word_count: int, senten
     except ZeroDivisionError:
         return "N/A"
 
-def compute_dale_chall_index(text: str) -> float:
-    return round(textstat.dale_chall_readability_score(text), 2)
+def compute_dale_chall_index(word_count: int, sentence_count: int, difficult_word_count: int) -> float | str:
+    if word_count == 0:
+        return "N/A"
+    # Like textstat: the share of distinct difficult words, plus average sentence length
+    difficult_pct = 100 * difficult_word_count / word_count
+    score = 0.1579 * difficult_pct + 0.0496 * (word_count / max(1, sentence_count))
+    if difficult_pct > 5:
+        score += 3.6365
+    return round(score, 2)
 
-def compute_forcast_index(text: str) -> float:
-    words = [token.text for token in nlp(text) if token.is_alpha]
-    sample = words[:150]  # first 150 words
-    monosyllables = sum(1 for w in sample if textstat.syllable_count(w) == 1)
+def compute_forcast_index(monosyllables: int) -> float:
+    # `monosyllables` among the first FORCAST_SAMPLE_WORDS words
     score = 20 - (monosyllables / 10)
     return round(score, 2)
 
-def compute_linsear_write_index(text: str) -> float:
-    words = [token.text for token in nlp(text) if token.is_alpha]
-    sentences = list(nlp(text).sents)
-    sample_words = words[:100]  # first 100 words
-    easy = sum(1 for w in sample_words if textstat.syllable_count(w) <= 2)
-    hard = sum(1 for w in sample_words if textstat.syllable_count(w) >= 3)
-    sentence_count = max(1, len(sentences))
+def compute_linsear_write_index(easy: int, hard: int, sentence_count: int) -> float:
+    # `easy` (<= 2 syllables) and `hard` words among the first LINSEAR_SAMPLE_WORDS words
+    sentence_count = max(1, sentence_count)
     score = (easy + 3 * hard) / sentence_count
     if score > 20:
         score /= 2
@@ -98,27 +151,165 @@ def compute_linsear_write_index(text: str) -> float:
         score -= 2
     return round(score, 2)
 
-def compute_lix(text: str) -> float:
-    doc = nlp(text)
-    sentences = list(doc.sents)
-    words = [token.text for token in doc if token.is_alpha]
-    word_count = len(words)
-    sentence_count = max(1, len(sentences))
-    long_words = sum(1 for w in words if len(w) > 6)
-    score = (word_count / sentence_count) + 100 * (long_words / word_count)
+def compute_lix(word_count: int, sentence_count: int, long_word_count: int) -> float | str:
+    if word_count == 0:
+        return "N/A"
+    sentence_count = max(1, sentence_count)
+    score = (word_count / sentence_count) + 100 * (long_word_count / word_count)
     return round(score, 2)
 
-def compute_rix(text: str) -> float:
-    doc = nlp(text)
-    sentences = list(doc.sents)
-    words = [token.text for token in doc if token.is_alpha]
-    long_words = sum(1 for w in words if len(w) > 6)
-    sentence_count = max(1, len(sentences))
-    score = long_words / sentence_count
+def compute_rix(long_word_count: int, sentence_count: int) -> float:
+    sentence_count = max(1, sentence_count)
+    score = long_word_count / sentence_count
     return round(score, 2)
 
+class ReadabilityAccumulator:
+    """
+    Readability of text that arrives in fragments, e.g. a streaming LLM response.
+
+    feed() buffers fragments and parses them a chunk (cut at whitespace) at a time,
+    keeping only running counts: sentences, words, syllables, polysyllables, characters,
+    long words and the FORCAST / Linsear first-N-word tallies. Memory is bounded by
+    the chunk size and the vocabulary (per-word lookups, distinct difficult words),
+    not by the length of the text. finalize() parses the remainder and returns the
+    same dict as get_readability_metrics(text) would for the whole text.
+
+    Parsing is CPU-bound, so a timed loop (measure_stream) should hand fragments to a
+    ReadabilityConsumer rather than call feed() itself.
+    """
+
+    def __init__(self, chunk_chars: int = ACCUMULATOR_CHUNK_CHARS):
+        self.chunk_chars = chunk_chars
+        self._pending = []
+        self._pending_chars = 0
+        self._word_features = {}
+        # True while the last parsed chunk ended mid-sentence
+        self._open_sentence = False
+        self._stats = dict.fromkeys((
+            "sentence_count", "word_count", "syllable_count", "polysyllable_count", "char_count",
+            "long_word_count", "forcast_monosyllables", "linsear_easy", "linsear_hard",
+        ), 0)
+
+    def feed(self, fragment: str):
+        if not fragment:
+            return
+        self._pending.append(fragment)
+        self._pending_chars += len(fragment)
+        if self._pending_chars < self.chunk_chars:
+            return
+        text = "".join(self._pending)
+        # Cut at the last whitespace so no word is split across chunks; a chunk with no
+        # whitespace at all (e.g. a long URL or base64 blob) is parsed whole - its pieces
+        # count as separate words - so the buffer never grows past one chunk plus a fragment
+        cut = max(text.rfind(" "), text.rfind("\n"), text.rfind("\t"))
+        if cut <= 0:
+            cut = len(text)
+        self._consume(text[:cut])
+        rest = text[cut:]
+        self._pending = [rest] if rest else []
+        self._pending_chars = len(rest)
+
+    def _consume(self, text: str):
+        nlp = get_nlp()
+        doc = nlp(text)
+        tokens = [token for token in doc if not token.is_space]
+        if not tokens:
+            return
+        stats = self._stats
+        sentences = sum(1 for _ in doc.sents)
+        # The sentencizer starts a sentence after sentence-final punctuation; a chunk
+        # that did not end on one continues its last sentence into this chunk
+        stats["sentence_count"] += sentences - 1 if self._open_sentence else sentences
+        for token in tokens:
+            if not token.is_alpha:
+                continue
+            length, syllables, _ = _word_row(token.text, self._word_features)
+            position = stats["word_count"]
+            stats["word_count"] += 1
+            stats["syllable_count"] += syllables
+            stats["char_count"] += length
+            stats["polysyllable_count"] += syllables >= 3
+            stats["long_word_count"] += length > 6
+            if position < FORCAST_SAMPLE_WORDS:
+                stats["forcast_monosyllables"] += syllables == 1
+            if position < LINSEAR_SAMPLE_WORDS:
+                stats["linsear_easy"] += syllables <= 2
+                stats["linsear_hard"] += syllables >= 3
+        punct_chars = nlp.get_pipe("sentencizer").punct_chars
+        trailing = []
+        for token in reversed(tokens):
+            if not token.is_punct:
+                break
+            trailing.append(token.text)
+        self._open_sentence = not any(t in punct_chars for t in trailing)
+
+    def finalize(self) -> dict:
+        """Parse whatever is still buffered and return the readability metrics."""
+        if self._pending:
+            self._consume("".join(self._pending))
+            self._pending, self._pending_chars = [], 0
+        difficult = sum(1 for *_, is_difficult in self._word_features.values() if is_difficult)
+        return readability_from_stats({**self._stats, "difficult_word_count": difficult})
+
+class ReadabilityConsumer:
+    """
+    Runs a ReadabilityAccumulator on a background thread. put() only queues the
+    fragment, so it can be called from a timed stream loop; close() marks the end of
+    the text and finalize() waits for the queued fragments to be parsed and returns
+    the metrics (None when parsing failed, e.g. spaCy is not installed).
+    """
+
+    def __init__(self, chunk_chars: int = ACCUMULATOR_CHUNK_CHARS):
+        self._accumulator = ReadabilityAccumulator(chunk_chars)
+        self._fragments = queue.SimpleQueue()
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="readability-consumer", daemon=True)
+        self._thread.start()
+
+    def put(self, fragment: str):
+        self._fragments.put(fragment)
+
+    def close(self):
+        self._fragments.put(None)
+
+    def _run(self):
+        while True:
+            fragment = self._fragments.get()
+            if fragment is None:
+                return
+            if self._error is None:
+                # After a failure the rest of the fragments are drained unparsed
+                try:
+                    self._accumulator.feed(fragment)
+                except Exception as e:
+                    self._error = e
+
+    def finalize(self) -> dict | None:
+        self.close()
+        self._thread.join()
+        if self._error is None:
+            try:
+                return self._accumulator.finalize()
+            except Exception as e:
+                self._error = e
+        logging.warning(f"Streamed readability unavailable ({self._error}); scoring the full response instead")
+        return None
+
 def get_readability_metrics(text: str) -> dict:
-    stats = get_text_stats(text)
+    return readability_from_stats(get_text_stats(analyze_text(text)))
+
+def get_readability_metrics_batch(texts: list, batch_size: int = READABILITY_BATCH_SIZE,
+                                  n_process: int = 1) -> list:
+    """
+    Readability metrics for many texts in one nlp.pipe pass, in input order.
+    `n_process` > 1 lets spaCy parse on several processes (worth it for hundreds of texts).
+    """
+    return [
+        readability_from_stats(get_text_stats(_analyze_doc(doc)))
+        for doc in get_nlp().pipe(texts, batch_size=batch_size, n_process=n_process)
+    ]
+
+def readability_from_stats(stats: dict) -> dict:
     flesch = compute_flesch_reading_ease(
         stats["sentence_count"], stats["word_count"], stats["syllable_count"]
     )
@@ -135,19 +326,19 @@ def get_readability_metrics(text: str) -> dict:
         stats["char_count"], stats["word_count"], stats["sentence_count"]
     )
     dale_chall = compute_dale_chall_index(
-        text
+        stats["word_count"], stats["sentence_count"], stats["difficult_word_count"]
     )
     forcast = compute_forcast_index(
-        text
+        stats["forcast_monosyllables"]
     )
     linsear_write = compute_linsear_write_index(
-        text
+        stats["linsear_easy"], stats["linsear_hard"], stats["sentence_count"]
     )
     lix = compute_lix(
-        text
+        stats["word_count"], stats["sentence_count"], stats["long_word_count"]
     )
     rix = compute_rix(
-        text
+        stats["long_word_count"], stats["sentence_count"]
     )
     return {
         "sentence_count": stats["sentence_count"],
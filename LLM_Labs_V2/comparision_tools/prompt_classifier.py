@@ -1,12 +1,90 @@
-def classify_prompt(prompt: str) -> str:
-    prompt = prompt.lower()
-    if any(word in prompt for word in ["prove", "solve", "equation", "math", "calculate"]):
-        return "Math"
-    elif any(word in prompt for word in ["story", "poem", "imagine", "creative"]):
-        return "Creative"
-    elif any(word in prompt for word in ["why", "how", "explain", "analyze", "reason"]):
-        return "Reasoning"
-    elif any(word in prompt for word in ["when", "where", "what", "who", "define", "describe"]):
-        return "Knowledge"
-    else:
-        return "General"
+import os
+import re
+import logging
+
+# "keywords": the whole-word keyword rules below. "embedding": nearest category centroid
+# of a sentence-transformer embedding (see comparision_tools.embedding_classifier); a call
+# whose embedding fails falls back to keywords, and the next call tries embedding again.
+CLASSIFIER_MODES = ("keywords", "embedding")
+PROMPT_CLASSIFIER_MODE = os.getenv("PROMPT_CLASSIFIER_MODE", "keywords")
+
+# Category -> keywords, in priority order: a prompt is labelled with the first category
+# that has any hit, and "General" when none does. Keywords match whole words only (plus
+# a plural "s"/"es"), so "show" is not "how" and "mathematics" is not "math".
+PROMPT_CATEGORIES = {
+    "Math": ["prove", "solve", "equation", "math", "calculate"],
+    "Creative": ["story", "poem", "imagine", "creative"],
+    "Reasoning": ["why", "how", "explain", "analyze", "reason"],
+    "Knowledge": ["when", "where", "what", "who", "define", "describe"],
+}
+DEFAULT_CATEGORY = "General"
+
+# Every keyword form -> its category, so a prompt is scanned once, word by word, with a
+# dict lookup per word however many keywords there are
+_KEYWORD_CATEGORIES = {}
+for _category, _keywords in PROMPT_CATEGORIES.items():
+    for _keyword in _keywords:
+        for _suffix in ("", "s", "es"):
+            _KEYWORD_CATEGORIES.setdefault(_keyword + _suffix, _category)
+_WORD = re.compile(r"\w+")
+
+
+def _use_embedding(mode: str) -> bool:
+    mode = mode or PROMPT_CLASSIFIER_MODE
+    if mode not in CLASSIFIER_MODES:
+        raise ValueError(f"Unknown prompt classifier mode: {mode}")
+    return mode == "embedding"
+
+
+def _embedding_unavailable(e: Exception):
+    logging.warning(f"Embedding prompt classifier unavailable ({e}); using keyword rules for these prompts")
+
+
+def score_prompts(prompts: list, mode: str = None) -> list:
+    """
+    Per-category scores for many prompts, every category present: keyword hits
+    ({category: count}) or, in embedding mode, cosine similarity to each category centroid.
+    """
+    prompts = list(prompts)
+    if _use_embedding(mode):
+        try:
+            from comparision_tools.embedding_classifier import CATEGORY_EXAMPLES, category_similarities
+            return [
+                {category: round(float(score), 4) for category, score in zip(CATEGORY_EXAMPLES, row)}
+                for row in category_similarities(prompts)
+            ]
+        except Exception as e:
+            _embedding_unavailable(e)
+    find_words, lookup = _WORD.findall, _KEYWORD_CATEGORIES.get
+    scores = []
+    for prompt in prompts:
+        hits = dict.fromkeys(PROMPT_CATEGORIES, 0)
+        for category in map(lookup, find_words(prompt.lower())):
+            if category:
+                hits[category] += 1
+        scores.append(hits)
+    return scores
+
+
+def classify_prompts(prompts: list, mode: str = None) -> list:
+    """
+    Category label for each prompt. Keyword mode follows PROMPT_CATEGORIES' priority
+    order; embedding mode embeds the prompts in one batch (cached) and takes the nearest centroid.
+    """
+    prompts = list(prompts)
+    if _use_embedding(mode):
+        try:
+            from comparision_tools.embedding_classifier import classify_by_embedding
+            return classify_by_embedding(prompts)
+        except Exception as e:
+            _embedding_unavailable(e)
+    find_words, lookup = _WORD.findall, _KEYWORD_CATEGORIES.get
+    labels = []
+    for prompt in prompts:
+        found = set(map(lookup, find_words(prompt.lower())))
+        labels.append(next((category for category in PROMPT_CATEGORIES if category in found), DEFAULT_CATEGORY))
+    return labels
+
+
+def classify_prompt(prompt: str, mode: str = None) -> str:
+    return classify_prompts([prompt], mode)[0]
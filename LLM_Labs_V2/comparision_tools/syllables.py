@@ -0,0 +1,108 @@
+import os
+import mmap
+import array
+import struct
+import hashlib
+import tempfile
+import logging
+import threading
+from bisect import bisect_left
+from functools import lru_cache
+
+import textstat
+
+# Syllable counts from the CMU Pronouncing Dictionary, stored as a compact table:
+# a header, the sorted 64-bit word hashes, then one count byte per hash. The file is
+# mmapped, so scoring processes share one copy, and lookups are a bisect over the hashes.
+# It is built on first use from the `cmudict` package (or NLTK's cmudict corpus);
+# words missing from it fall back to textstat's heuristic.
+SYLLABLE_TABLE_FILE = os.getenv("SYLLABLE_TABLE_FILE", "syllable_table.bin")
+SYLLABLE_CACHE_SIZE = 50_000
+
+_TABLE_MAGIC = b"SYL1"
+_HEADER = struct.Struct("=4sI")
+
+_table = None
+_table_loaded = False
+_table_lock = threading.Lock()
+
+
+def _word_hash(word: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _load_pronunciations() -> dict:
+    try:
+        import cmudict
+        return cmudict.dict()
+    except ImportError:
+        from nltk.corpus import cmudict
+        return cmudict.dict()
+
+
+def build_syllable_table(path: str = SYLLABLE_TABLE_FILE, pronunciations: dict = None) -> int:
+    """Write the syllable table for `pronunciations` ({word: [[phones]]}, CMU dict by default); returns its size."""
+    if pronunciations is None:
+        pronunciations = _load_pronunciations()
+    counts = {}
+    for word, variants in pronunciations.items():
+        if variants:
+            # Stressed vowels end in a digit (AH0, EY1); the first pronunciation is the common one
+            counts.setdefault(_word_hash(word.lower()), sum(phone[-1].isdigit() for phone in variants[0]))
+    hashes = sorted(counts)
+    # Scoring workers may all build the table at once: each writes its own temp file,
+    # and os.replace publishes only complete tables
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_TABLE_MAGIC, len(hashes)))
+            array.array("Q", hashes).tofile(f)
+            f.write(bytes(min(counts[h], 255) for h in hashes))
+        # mkstemp creates the file 0600; the table is shared with every user of the cache dir
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(hashes)
+
+
+def _open_table(path: str):
+    with open(path, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, size = _HEADER.unpack_from(data)
+    if magic != _TABLE_MAGIC or len(data) != _HEADER.size + 9 * size:
+        raise ValueError(f"{path} is not a syllable table")
+    hashes_end = _HEADER.size + 8 * size
+    return memoryview(data)[_HEADER.size:hashes_end].cast("Q"), memoryview(data)[hashes_end:]
+
+
+def _get_table():
+    global _table, _table_loaded
+    if _table_loaded:
+        return _table
+    with _table_lock:
+        if not _table_loaded:
+            try:
+                if not os.path.exists(SYLLABLE_TABLE_FILE):
+                    build_syllable_table(SYLLABLE_TABLE_FILE)
+                _table = _open_table(SYLLABLE_TABLE_FILE)
+            except Exception as e:
+                logging.warning(f"Syllable table unavailable ({e}); using textstat's syllable heuristic")
+                _table = None
+            _table_loaded = True
+    return _table
+
+
+@lru_cache(maxsize=SYLLABLE_CACHE_SIZE)
+def syllable_count(word: str) -> int:
+    """Syllables in one word: the CMU dictionary count when listed, textstat's estimate otherwise."""
+    table = _get_table()
+    if table is not None:
+        hashes, counts = table
+        key = _word_hash(word.lower())
+        i = bisect_left(hashes, key)
+        if i < len(hashes) and hashes[i] == key:
+            return counts[i]
+    return textstat.syllable_count(word)
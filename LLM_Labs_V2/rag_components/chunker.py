@@ -1,9 +1,6 @@
 import logging
-from langchain.text_splitter import (
-    TokenTextSplitter, 
-    CharacterTextSplitter, 
-    RecursiveCharacterTextSplitter
-)
+
+# langchain's splitters are imported inside each chunker, when RAG mode first uses them
 
 # Configure logging
 logging.basicConfig(
@@ -15,6 +12,7 @@ logging.basicConfig(
 def token_chunker(text: str, chunk_size: int = 256, chunk_overlap: int = 20, method_name: str = "TokenTextSplitter"):
     logging.info(f"User selected chunking method: {method_name}")
     try:
+        from langchain.text_splitter import TokenTextSplitter
         splitter = TokenTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
         chunks = splitter.split_text(text)
         logging.info(f"[{method_name}] Generated {len(chunks)} chunks with chunk_size={chunk_size}, chunk_overlap={chunk_overlap}")
@@ -26,6 +24,7 @@ def token_chunker(text: str, chunk_size: int = 256, chunk_overlap: int = 20, met
 def tiktoken_chunker(text: str, model_name: str = "gpt-3.5-turbo", chunk_size: int = 256, chunk_overlap: int = 20, method_name: str = "TiktokenChunker"):
     logging.info(f"User selected chunking method: {method_name}")
     try:
+        from langchain.text_splitter import CharacterTextSplitter
         splitter = CharacterTextSplitter.from_tiktoken_encoder(
             model_name=model_name,
             chunk_size=chunk_size,
@@ -41,6 +40,7 @@ def tiktoken_chunker(text: str, model_name: str = "gpt-3.5-turbo", chunk_size: i
 def char_chunker(text: str, chunk_size: int = 1000, chunk_overlap: int = 100, separator: str = "\n", method_name: str = "CharacterTextSplitter"):
     logging.info(f"User selected chunking method: {method_name}")
     try:
+        from langchain.text_splitter import CharacterTextSplitter
         splitter = CharacterTextSplitter(separator=separator, chunk_size=chunk_size, chunk_overlap=chunk_overlap)
         chunks = splitter.split_text(text)
         logging.info(f"[{method_name}] Generated {len(chunks)} chunks with chunk_size={chunk_size}, chunk_overlap={chunk_overlap}, separator='{separator}'")
@@ -52,6 +52,7 @@ def char_chunker(text: str, chunk_size: int = 1000, chunk_overlap: int = 100, se
 def recursive_char_chunker(text: str, chunk_size: int = 500, chunk_overlap: int = 50, separators: list = ["\n\n", "\n", " ", ""], method_name: str = "RecursiveCharacterTextSplitter"):
     logging.info(f"User selected chunking method: {method_name}")
     try:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
         splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=separators)
         chunks = splitter.split_text(text)
         logging.info(f"[{method_name}] Generated {len(chunks)} chunks with chunk_size={chunk_size}, chunk_overlap={chunk_overlap}, separators={separators}")
@@ -63,6 +64,7 @@ def recursive_char_chunker(text: str, chunk_size: int = 500, chunk_overlap: int
 def sentence_chunker(text: str, chunk_size: int = 500, chunk_overlap: int = 50, separators: list = [". ", "! ", "? ", "\n"], method_name: str = "SentenceChunker"):
     logging.info(f"User selected chunking method: {method_name}")
     try:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
         splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap, separators=separators)
         chunks = splitter.split_text(text)
         logging.info(f"[{method_name}] Generated {len(chunks)} chunks with chunk_size={chunk_size}, chunk_overlap={chunk_overlap}, separators={separators}")
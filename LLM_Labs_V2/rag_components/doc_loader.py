@@ -1,6 +1,3 @@
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.document_loaders import Docx2txtLoader
-from langchain_community.document_loaders import TextLoader
 import os
 import logging
 
@@ -11,6 +8,7 @@ logger = logging.getLogger(__name__)
 def load_pdf(file_path: str) -> str:
     try:
         logger.info(f"Loading PDF document: {file_path}")
+        from langchain_community.document_loaders import PyPDFLoader
         loader = PyPDFLoader(file_path)
         docs = loader.load()
         contents = [doc.page_content for doc in docs]
@@ -22,6 +20,7 @@ def load_pdf(file_path: str) -> str:
 def load_docx(file_path: str) -> str:
     try:
         logger.info(f"Loading DOCX document: {file_path}")
+        from langchain_community.document_loaders import Docx2txtLoader
         loader = Docx2txtLoader(file_path)
         docs = loader.load()
         contents = [doc.page_content for doc in docs]
@@ -33,6 +32,7 @@ def load_docx(file_path: str) -> str:
 def load_txt(file_path: str) -> str:
     try:
         logger.info(f"Loading TXT document: {file_path}")
+        from langchain_community.document_loaders import TextLoader
         loader = TextLoader(file_path, encoding="utf-8")
         docs = loader.load()
         contents = [doc.page_content for doc in docs]
@@ -1,16 +1,17 @@
 import logging
+from functools import lru_cache
 from typing import List, Dict
-import numpy as np
-from langchain_huggingface import HuggingFaceEmbeddings
-from huggingface_hub import list_models
-from huggingface_hub.errors import HfHubHTTPError
-from sklearn.metrics.pairwise import cosine_similarity, euclidean_distances
+
+# numpy, sklearn, langchain_huggingface and huggingface_hub are imported on first
+# use, and the Hub is only queried when AVAILABLE_MODELS is first read
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # 🔹 Fetch all sentence-transformer models
 def get_all_sentence_transformer_models() -> List[str]:
+    from huggingface_hub import list_models
+    from huggingface_hub.errors import HfHubHTTPError
     try:
         logger.info("Fetching all sentence-transformer models from Hugging Face Hub...")
         models = list_models(search="sentence-transformers/")
@@ -24,11 +25,21 @@ def get_all_sentence_transformer_models() -> List[str]:
         logger.error(f"Unexpected error while fetching models: {e}")
         return []
 
-AVAILABLE_MODELS = get_all_sentence_transformer_models()
+@lru_cache(maxsize=1)
+def get_available_models() -> List[str]:
+    """Sentence-transformer model ids, fetched from the Hub once per process."""
+    return get_all_sentence_transformer_models()
+
+def __getattr__(name: str):
+    # Keeps `from rag_components.embedding_model import AVAILABLE_MODELS` working without a Hub call at import
+    if name == "AVAILABLE_MODELS":
+        return get_available_models()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 🔹 Initialize embeddings
 def get_huggingface_embeddings(model_name: str):
     try:
+        from langchain_huggingface import HuggingFaceEmbeddings
         logger.info(f"Initializing HuggingFaceEmbeddings with model: {model_name}")
         embeddings = HuggingFaceEmbeddings(model_name=model_name)
         return embeddings
@@ -53,6 +64,8 @@ def embed_chunks(chunks: List[str], model_name: str):
 
 # 🔹 Compare embeddings for retrieval evaluation
 def compare_embeddings(query: str, chunks: List[str], vectors: List[List[float]], model_name: str) -> List[Dict]:
+    import numpy as np
+    from sklearn.metrics.pairwise import cosine_similarity, euclidean_distances
     logger.info(f"Comparing embeddings for query: '{query}' using {model_name}")
 
     embedder = get_huggingface_embeddings(model_name)
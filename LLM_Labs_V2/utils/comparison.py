@@ -1,10 +1,25 @@
 import time
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 
-from utils.llms import query_groq_llm, query_gemini_llm, query_ollama_llm
-from comparision_tools.tokenizer import count_tokens
-from comparision_tools.prompt_classifier import classify_prompt
-from comparision_tools.metrics import get_readability_metrics
+from utils.llms import (
+    query_groq_llm, query_gemini_llm, query_ollama_llm, query_mock_llm,
+    stream_groq_llm, stream_gemini_llm, stream_ollama_llm, stream_mock_llm,
+    client_pool_stats, preload_ollama_model, OLLAMA_KEEP_ALIVE
+)
+from utils.rate_limiter import MAX_RETRIES, call_with_retry, configure_rate_limits, get_limiter
+from utils.deadlines import (
+    DEFAULT_CALL_TIMEOUT_SECONDS, RunDeadlineExceeded, call_with_deadline,
+    hedge_threshold, record_latency, remaining_time
+)
+from utils.response_cache import CACHE_MODES, make_cache_key, cache_get, cache_put, prune_cache
+from utils.results_store import start_run, record_result
+from comparision_tools.latency import measure_stream, summarize_samples
+from utils.metrics_pool import DEFAULT_METRICS_WORKERS, get_metrics_pool, score_response, score_responses
+from utils.prompts import input_token_count, template_id
+from comparision_tools.prompt_classifier import classify_prompt, classify_prompts
 
 # Logger setup
 logging.basicConfig(
@@ -13,105 +28,451 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Max in-flight calls per provider when running concurrently.
+# Ollama serves one local model at a time, so it stays serial by default.
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "groq": 4,
+    "gemini": 4,
+    "ollama": 1,
+    "mock": 8,
+}
 
-def run_comparative_evaluation(providers_models: dict, prompts: dict, user_input: str):
-    results = {}
+# Each result is written as several log lines and the report parser splits
+# entries on the dashed separator, so concurrent cells must not interleave.
+_log_lock = threading.Lock()
 
-    for provider, models in providers_models.items():
-        for model in models:
-            for prompt_name, prompt in prompts.items():
-                key = f"{provider}_{model}_{prompt_name}"
-                start_time = time.time()
 
-                try:
-                    input_tokens = count_tokens(user_input + prompt)
-                    prompt_type = classify_prompt(prompt)
-                    prompt_length_words = len(prompt.split())
-
-                    if provider == "groq":
-                        response = query_groq_llm(user_input=user_input, model=model, prompt=prompt)
-                    elif provider == "gemini":
-                        response = query_gemini_llm(user_input=user_input, model=model, prompt=prompt)
-                    elif provider == "ollama":
-                        response = query_ollama_llm(user_input=user_input, model=model, prompt=prompt)
-                    else:
-                        response = "[Unsupported provider]"
-
-                    duration = round(time.time() - start_time, 3)
-                    output_tokens = count_tokens(response)
-                    readability = get_readability_metrics(response)
-
-                    results[key] = {
-                        "provider": provider,
-                        "model": model,
-                        "prompt_name": prompt_name,
-                        "prompt_type": prompt_type,
-                        "prompt_length_words": prompt_length_words,
-                        "input_tokens": input_tokens,
-                        "output_tokens": output_tokens,
-                        "total_tokens": input_tokens + output_tokens,
-                        "response": response,
-                        "response_time": duration,
-                        "length": len(response.split()),
-                        "readability": readability
-                    }
-
-                    logging.info(f"Provider: {provider.upper()} | Model: {model} | Prompt: {prompt_name}")
-                    logging.info(f"Prompt Type: {prompt_type} | Prompt Length: {prompt_length_words} words")
-                    logging.info(f"Tokens (Input/Output/Total): {input_tokens}/{output_tokens}/{input_tokens + output_tokens}")
-                    logging.info(f"Response Time: {duration}s | Words: {len(response.split())}")
-                    logging.info(
-                        f"Readability - Sentences: {readability['sentence_count']}, "
-                        f"Syllables: {readability['syllable_count']}, "
-                        f"Flesch Score: {readability['flesch_reading_ease']}, "
-                        f"SMOG Index: {readability['smog_index']}, "
-                        f"Coleman-Liau Index: {readability['coleman_liau_index']}, "
-                        f"Gunning Fog Index: {readability['gunning_fog_index']}, "
-                        f"Automated Readability Index: {readability['automated_readability_index']}, "
-                        f"Dale-Chall: {readability['dale_chall_index']}, "
-                        f"FORCAST: {readability['forcast_index']}, "
-                        f"Linsear Write: {readability['linsear_write_index']}, "
-                        f"LIX: {readability['lix']}, "
-                        f"RIX: {readability['rix']}, "
-                    )
-                    logging.info(f"Response:\n{response}\n{'-'*50}")
-
-                except Exception as e:
-                    logging.error(f"Error querying {provider} ({model}) with {prompt_name}: {e}")
-                    results[key] = {
-                        "provider": provider,
-                        "model": model,
-                        "prompt_name": prompt_name,
-                        "response": f"Error: {e}",
-                        "response_time": None,
-                        "length": 0,
-                        "input_tokens": 0,
-                        "output_tokens": 0,
-                        "total_tokens": 0,
-                        "prompt_type": "Unknown",
-                        "prompt_length_words": 0,
-                        "readability": {
-                            "sentence_count": 0,
-                            "syllable_count": 0,
-                            "flesch_reading_ease": "N/A",
-                            "smog_index": "N/A",            
-                            "coleman_liau_index": "N/A" ,
-                            "gunning_fog_index": "N/A" ,
-                            "automated_readability_index": "N/A" ,
-                            "dale_chall_index": "N/A",
-                            "forcast_index": "N/A",
-                            "linsear_write_index": "N/A",
-                            "lix": "N/A",
-                            "rix": "N/A" ,
-                        }
-                    }
+def _query_provider(provider: str, model: str, prompt: str, user_input: str, timeout: float = None,
+                    keep_alive=OLLAMA_KEEP_ALIVE) -> tuple[str, dict]:
+    """Return (response, provider-reported usage/timings); empty when the provider reports none."""
+    if provider == "groq":
+        return query_groq_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout, return_meta=True)
+    elif provider == "gemini":
+        return query_gemini_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout, return_meta=True)
+    elif provider == "ollama":
+        return query_ollama_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout,
+                                keep_alive=keep_alive, return_meta=True)
+    elif provider == "mock":
+        return query_mock_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout,
+                              keep_alive=keep_alive, return_meta=True)
+    else:
+        return "[Unsupported provider]", {}
+
+
+def _stream_provider(provider: str, model: str, prompt: str, user_input: str, timeout: float = None,
+                     keep_alive=OLLAMA_KEEP_ALIVE) -> tuple[str, dict, dict]:
+    meta = {}
+    if provider == "groq":
+        chunks = stream_groq_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout, meta=meta)
+    elif provider == "gemini":
+        chunks = stream_gemini_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout, meta=meta)
+    elif provider == "ollama":
+        chunks = stream_ollama_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout,
+                                   keep_alive=keep_alive, meta=meta)
+    elif provider == "mock":
+        chunks = stream_mock_llm(user_input=user_input, model=model, prompt=prompt, timeout=timeout,
+                                 keep_alive=keep_alive, meta=meta)
+    else:
+        return "[Unsupported provider]", None, meta
+    # Readability is parsed on a consumer thread as the text streams in, off the timed
+    # loop; the caller finalizes it once the call is timed
+    from comparision_tools.metrics import ReadabilityConsumer
+    readability = ReadabilityConsumer()
+    try:
+        response, stream_metrics = measure_stream(chunks, on_fragment=readability.put)
+    finally:
+        readability.close()
+    meta["readability_consumer"] = readability
+    return response, stream_metrics, meta
+
+
+def _call_provider(provider: str, model: str, prompt: str, user_input: str, stream: bool,
+                   timeout: float = None, keep_alive=OLLAMA_KEEP_ALIVE) -> tuple[str, float, dict, dict]:
+    """
+    Run one provider call and return (response, wall-clock seconds, stream timings or None,
+    provider-reported meta: token usage and, for Ollama, load / prompt eval / eval durations).
+    """
+    start_time = time.perf_counter()
+    if stream:
+        response, stream_metrics, meta = _stream_provider(provider, model, prompt, user_input, timeout, keep_alive)
+    else:
+        (response, meta), stream_metrics = _query_provider(provider, model, prompt, user_input, timeout, keep_alive), None
+    return response, round(time.perf_counter() - start_time, 4), stream_metrics, meta
+
+
+def _run_trials(provider: str, model: str, prompt: str, user_input: str, stream: bool,
+                warmup: int, trials: int, max_retries: int = MAX_RETRIES,
+                call_timeout: float = DEFAULT_CALL_TIMEOUT_SECONDS, deadline: float = None,
+                hedge_percentile: float = None, keep_alive=OLLAMA_KEEP_ALIVE) -> tuple[str, list, dict, dict, dict, dict]:
+    """
+    Issue `warmup` discarded calls, then `trials` measured calls, each behind the
+    provider/model rate limiter with retry on 429s and transient errors.
+    Every call is bounded by `call_timeout` and the run `deadline` (time.monotonic()),
+    and with `hedge_percentile` a slow call is hedged with a duplicate request.
+    Returns the last measured response, every measured duration, the last stream
+    timings, the accumulated {"retries", "throttle_wait"} and {"hedged", "hedge_won"},
+    and the provider-reported timings of the last measured call.
+    Durations only cover the successful attempt, never limiter waits or backoff;
+    a hedged call is timed from the original request to the first answer.
+    """
+    retry_info = {"retries": 0, "throttle_wait": 0.0}
+    hedge_info = {"hedged": False, "hedge_won": False}
+    limiter = get_limiter(provider, model)
+
+    def attempt():
+        left = remaining_time(deadline)
+        if left is not None and left <= 0:
+            raise RunDeadlineExceeded("run deadline exceeded")
+        timeouts = [t for t in (call_timeout, left) if t is not None]
+        timeout = min(timeouts) if timeouts else None
+        # Ollama/mock clients are registered per timeout (a constructor argument), so they
+        # get the fixed call timeout; call_with_deadline still cuts them off at the deadline
+        request_timeout = call_timeout if provider in ("ollama", "mock") else timeout
+        hedge_after = hedge_threshold(provider, model, hedge_percentile) if hedge_percentile else None
+
+        start_time = time.perf_counter()
+        (response, duration, stream_metrics, meta), flags = call_with_deadline(
+            lambda: _call_provider(provider, model, prompt, user_input, stream, request_timeout, keep_alive),
+            timeout=timeout,
+            hedge_after=hedge_after,
+            can_hedge=limiter.try_acquire if limiter is not None else None
+        )
+        if flags["hedged"]:
+            # The winner's own timings start late; shift them to the original request
+            waited = round(time.perf_counter() - start_time, 4)
+            # No TTFT to shift when the stream never yielded a non-empty fragment
+            if stream_metrics is not None and stream_metrics.get("ttft") is not None:
+                stream_metrics["ttft"] = round(stream_metrics["ttft"] + waited - duration, 4)
+            duration = waited
+            hedge_info["hedged"] = True
+            hedge_info["hedge_won"] = hedge_info["hedge_won"] or flags["hedge_won"]
+        record_latency(provider, model, duration)
+        return response, duration, stream_metrics, meta
+
+    def call():
+        try:
+            result, info = call_with_retry(attempt, provider, model, max_retries)
+        except Exception as e:
+            info = getattr(e, "retry_info", {"retries": 0, "throttle_wait": 0.0})
+            retry_info["retries"] += info["retries"]
+            retry_info["throttle_wait"] += info["throttle_wait"]
+            e.retry_info = {**retry_info, "throttle_wait": round(retry_info["throttle_wait"], 3)}
+            e.hedge_info = hedge_info
+            raise
+        retry_info["retries"] += info["retries"]
+        retry_info["throttle_wait"] += info["throttle_wait"]
+        return result
+
+    for _ in range(warmup):
+        call()
+
+    samples = []
+    response, stream_metrics, meta = None, None, {}
+    for _ in range(max(1, trials)):
+        response, duration, stream_metrics, meta = call()
+        samples.append(duration)
+    retry_info["throttle_wait"] = round(retry_info["throttle_wait"], 3)
+    return response, samples, stream_metrics, retry_info, hedge_info, meta
+
+
+def _log_result(result: dict):
+    readability = result["readability"]
+    with _log_lock:
+        logging.info(f"Provider: {result['provider'].upper()} | Model: {result['model']} | Prompt: {result['prompt_name']}")
+        logging.info(f"Prompt Type: {result['prompt_type']} | Prompt Length: {result['prompt_length_words']} words")
+        logging.info(
+            f"Tokens (Input/Output/Total): {result['input_tokens']}/{result['output_tokens']}/{result['total_tokens']}"
+            f" | Source: {result['token_source']}"
+        )
+        cached_note = " | Cached: yes" if result.get("cached") else ""
+        logging.info(f"Response Time: {result['response_time']}s | Words: {result['length']}{cached_note}")
+        if result.get("output_tokens_per_sec") is not None:
+            logging.info(
+                f"Throughput - Output: {result['output_tokens_per_sec']} tok/s | "
+                f"Prompt: {result['prompt_tokens_per_sec']} tok/s | Basis: {result['throughput_basis']}"
+            )
+        if result.get("retries") or result.get("throttle_wait"):
+            logging.info(f"Retries: {result['retries']} | Throttle Wait: {result['throttle_wait']}s")
+        if result.get("hedged"):
+            logging.info(f"Hedged: yes | Hedge Won: {'yes' if result['hedge_won'] else 'no'}")
+        if result.get("eval_time") is not None:
+            logging.info(
+                f"Server Timing - Load: {result['load_time']}s | Prompt Eval: {result['prompt_eval_time']}s | "
+                f"Eval: {result['eval_time']}s"
+            )
+        stats = result.get("latency_stats")
+        if stats and stats["n"] > 1:
+            logging.info(
+                f"Latency Stats (n={stats['n']}): p50={stats['p50']}s | p90={stats['p90']}s | p99={stats['p99']}s | "
+                f"mean={stats['mean']}s | stddev={stats['stddev']}s | 95% CI=[{stats['ci_low']}, {stats['ci_high']}]s"
+            )
+            logging.info(f"Latency Samples: {', '.join(str(x) for x in result['latency_samples'])}")
+        if result.get("stream_metrics"):
+            sm = result["stream_metrics"]
+            logging.info(
+                f"Streaming - TTFT: {sm['ttft']}s | "
+                f"ITL p50/p90/p99: {sm['itl_p50']}/{sm['itl_p90']}/{sm['itl_p99']} ms | "
+                f"Decode: {sm['decode_tokens_per_sec']} tok/s | Chunks: {sm['chunk_count']}"
+            )
+        logging.info(
+            f"Readability - Sentences: {readability['sentence_count']}, "
+            f"Syllables: {readability['syllable_count']}, "
+            f"Flesch Score: {readability['flesch_reading_ease']}, "
+            f"SMOG Index: {readability['smog_index']}, "
+            f"Coleman-Liau Index: {readability['coleman_liau_index']}, "
+            f"Gunning Fog Index: {readability['gunning_fog_index']}, "
+            f"Automated Readability Index: {readability['automated_readability_index']}, "
+            f"Dale-Chall: {readability['dale_chall_index']}, "
+            f"FORCAST: {readability['forcast_index']}, "
+            f"Linsear Write: {readability['linsear_write_index']}, "
+            f"LIX: {readability['lix']}, "
+            f"RIX: {readability['rix']}, "
+        )
+        logging.info(f"Response:\n{result['response']}\n{'-'*50}")
+
+
+def _error_result(provider: str, model: str, prompt_name: str, error: Exception) -> dict:
+    retry_info = getattr(error, "retry_info", {"retries": 0, "throttle_wait": 0.0})
+    hedge_info = getattr(error, "hedge_info", {"hedged": False, "hedge_won": False})
+    return {
+        "provider": provider,
+        "model": model,
+        "prompt_name": prompt_name,
+        "response": f"Error: {error}",
+        "response_time": None,
+        "length": 0,
+        "input_tokens": 0,
+        "output_tokens": 0,
+        "total_tokens": 0,
+        "token_source": "local",
+        "prompt_type": "Unknown",
+        "prompt_length_words": 0,
+        "stream_metrics": None,
+        "latency_samples": [],
+        "latency_stats": None,
+        "retries": retry_info["retries"],
+        "throttle_wait": retry_info["throttle_wait"],
+        "timed_out": isinstance(error, TimeoutError),
+        "hedged": hedge_info["hedged"],
+        "hedge_won": hedge_info["hedge_won"],
+        "cached": False,
+        "readability": {
+            "sentence_count": 0,
+            "syllable_count": 0,
+            "flesch_reading_ease": "N/A",
+            "smog_index": "N/A",
+            "coleman_liau_index": "N/A",
+            "gunning_fog_index": "N/A",
+            "automated_readability_index": "N/A",
+            "dale_chall_index": "N/A",
+            "forcast_index": "N/A",
+            "linsear_write_index": "N/A",
+            "lix": "N/A",
+            "rix": "N/A",
+        }
+    }
+
+
+def _cell_error(provider: str, model: str, prompt_name: str, error: Exception) -> dict:
+    logging.error(f"Error querying {provider} ({model}) with {prompt_name}: {error}")
+    return _error_result(provider, model, prompt_name, error)
+
+
+def _query_cell(provider: str, model: str, prompt_name: str, prompt: str, user_input: str,
+                semaphore: threading.Semaphore = None, stream: bool = False,
+                cache_mode: str = "off", warmup: int = 0, trials: int = 1,
+                max_retries: int = MAX_RETRIES, call_timeout: float = DEFAULT_CALL_TIMEOUT_SECONDS,
+                deadline: float = None, hedge_percentile: float = None,
+                keep_alive=OLLAMA_KEEP_ALIVE, prompt_types: dict = None) -> dict:
+    """
+    Query one provider/model/prompt cell (or replay it from the cache) and return
+    everything except the response scoring, which _finalize_cell adds. `prompt_types`
+    maps prompt text to its category, as labelled once per run.
+    """
+    prompt_type = (prompt_types or {}).get(prompt) or classify_prompt(prompt)
+    prompt_length_words = len(prompt.split())
+
+    cache_key = make_cache_key(provider, model, prompt, user_input, {"stream": stream})
+    cached = cache_get(cache_key) if cache_mode in ("use", "replay") else None
+
+    if cached is not None:
+        # Replayed cells keep the timings measured when the response was recorded
+        response = cached["response"]
+        samples = cached.get("latency_samples") or [cached["response_time"]]
+        stream_metrics = cached.get("stream_metrics")
+        meta = cached.get("provider_meta") or {}
+        retry_info = {"retries": 0, "throttle_wait": 0.0}
+        hedge_info = {"hedged": False, "hedge_won": False}
+        readability = None
+    elif cache_mode == "replay":
+        raise LookupError("no cached response (replay mode)")
+    else:
+        # The clock starts once the provider slot is acquired, so time spent
+        # queued behind other cells is not counted as response time.
+        trial_args = (
+            provider, model, prompt, user_input, stream, warmup, trials, max_retries,
+            call_timeout, deadline, hedge_percentile, keep_alive
+        )
+        if semaphore is not None:
+            with semaphore:
+                response, samples, stream_metrics, retry_info, hedge_info, meta = _run_trials(*trial_args)
+        else:
+            response, samples, stream_metrics, retry_info, hedge_info, meta = _run_trials(*trial_args)
+        # Streamed calls come back already parsed; the cache keeps provider data only
+        consumer = meta.pop("readability_consumer", None)
+        readability = consumer.finalize() if consumer is not None else None
+
+        if cache_mode in ("use", "refresh"):
+            cache_put(cache_key, {
+                "provider": provider,
+                "model": model,
+                "response": response,
+                "response_time": samples[-1],
+                "latency_samples": samples,
+                "stream_metrics": stream_metrics,
+                "provider_meta": meta,
+            })
+
+    # With repeated trials the cell's response time is the median, not one sample
+    latency_stats = summarize_samples(samples)
+
+    # Provider-reported usage is exact for the model's own tokenizer; the local count
+    # (closest tokenizer for the model's family) is only a fallback, with the template's
+    # tokens cached. Output tokens left as None are counted during scoring.
+    input_tokens = meta.get("prompt_tokens")
+    output_tokens = meta.get("completion_tokens")
+    from_provider = (input_tokens is not None) + (output_tokens is not None)
+    if input_tokens is None:
+        input_tokens = input_token_count(user_input, prompt, model)
+
+    return {
+        "provider": provider,
+        "model": model,
+        "prompt_name": prompt_name,
+        "prompt_id": template_id(prompt),
+        "prompt_type": prompt_type,
+        "prompt_length_words": prompt_length_words,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "token_source": ("local", "mixed", "provider")[from_provider],
+        "response": response,
+        "response_time": round(latency_stats["p50"], 3),
+        "length": len(response.split()),
+        "stream_metrics": stream_metrics,
+        "readability": readability,
+        # Server-side split of the last call (Ollama): model load, prompt eval (prefill), eval (decode)
+        "load_time": meta.get("load_time"),
+        "prompt_eval_time": meta.get("prompt_eval_time"),
+        "eval_time": meta.get("eval_time"),
+        "latency_samples": samples,
+        "latency_stats": latency_stats,
+        "retries": retry_info["retries"],
+        "throttle_wait": retry_info["throttle_wait"],
+        "timed_out": False,
+        "hedged": hedge_info["hedged"],
+        "hedge_won": hedge_info["hedge_won"],
+        "cached": cached is not None,
+    }
+
+
+def _dispatch_cell(provider: str, model: str, prompt_name: str, *args) -> tuple[dict, dict]:
+    """_query_cell that never raises: returns (queried cell, None) or (None, error result)."""
+    try:
+        return _query_cell(provider, model, prompt_name, *args), None
+    except Exception as e:
+        return None, _cell_error(provider, model, prompt_name, e)
+
 
+def _throughput(queried: dict, output_tokens: int) -> tuple[float, float, str]:
+    """
+    (output tokens/sec, prompt tokens/sec, basis) for one cell, from the best timing available:
+    - "server": Ollama's own eval / prompt eval durations (no network or load time)
+    - "stream": decode time after the first token; no prompt rate, since time to first
+      token also holds network and queueing, not just prefill
+    - "wall": output tokens over the whole response time; no prompt rate
+    Rates on different bases time different things and are not compared with each other.
+    """
+    def rate(tokens, seconds):
+        return round(tokens / seconds, 2) if tokens and seconds else None
+
+    stream_metrics = queried["stream_metrics"]
+    if queried.get("eval_time"):
+        return (
+            rate(output_tokens, queried["eval_time"]),
+            rate(queried["input_tokens"], queried.get("prompt_eval_time")),
+            "server",
+        )
+    if stream_metrics is not None:
+        return rate(output_tokens, stream_metrics["decode_time"]), None, "stream"
+    return rate(output_tokens, queried["response_time"]), None, "wall"
+
+
+def _finalize_cell(queried: dict, output_tokens: int, readability: dict) -> dict:
+    """Join a queried cell with its scoring into the full result and log it."""
+    stream_metrics = queried["stream_metrics"]
+    if stream_metrics is not None:
+        # Decode rate excludes the time spent waiting for the first token
+        decode_time = stream_metrics["decode_time"]
+        stream_metrics["decode_tokens_per_sec"] = (
+            round(output_tokens / decode_time, 2) if decode_time else "N/A"
+        )
+    output_tps, prompt_tps, basis = _throughput(queried, output_tokens)
+
+    result = {
+        **queried,
+        "output_tokens": output_tokens,
+        "total_tokens": queried["input_tokens"] + output_tokens,
+        "output_tokens_per_sec": output_tps,
+        "prompt_tokens_per_sec": prompt_tps,
+        "throughput_basis": basis,
+        "readability": readability,
+    }
+    _log_result(result)
+    return result
+
+
+def _print_results(results: dict):
     print("\n📊 LLM Comparison Results:")
     for key, result in results.items():
         print(f"\n🔹 {result['provider'].upper()} ({result['model']}) | Prompt: {result['prompt_name']}")
         print(f"🧠 Prompt Type: {result['prompt_type']} | Prompt Length: {result['prompt_length_words']} words")
-        print(f"🔢 Tokens - Input: {result['input_tokens']} | Output: {result['output_tokens']} | Total: {result['total_tokens']}")
-        print(f"⏱️ Response Time: {result['response_time']} seconds")
+        print(
+            f"🔢 Tokens - Input: {result['input_tokens']} | Output: {result['output_tokens']} | "
+            f"Total: {result['total_tokens']} (counted by: {result['token_source']})"
+        )
+        cached_note = " (replayed from cache)" if result.get("cached") else ""
+        print(f"⏱️ Response Time: {result['response_time']} seconds{cached_note}")
+        if result.get("output_tokens_per_sec") is not None:
+            prompt_rate = result["prompt_tokens_per_sec"]
+            print(
+                f"⚡ Throughput - Output: {result['output_tokens_per_sec']} tok/s | "
+                f"Prompt: {prompt_rate if prompt_rate is not None else 'N/A'} tok/s ({result['throughput_basis']} timing)"
+            )
+        if result.get("retries") or result.get("throttle_wait"):
+            print(f"🚦 Retries: {result['retries']} | Throttle Wait: {result['throttle_wait']} seconds (not in response time)")
+        if result.get("timed_out"):
+            print("⌛ Timed out (call or run deadline reached)")
+        if result.get("hedged"):
+            winner = "duplicate request" if result["hedge_won"] else "original request"
+            print(f"🪁 Hedged: a duplicate was sent after the latency threshold; the {winner} answered first")
+        stats = result.get("latency_stats")
+        if stats and stats["n"] > 1:
+            print(
+                f"📈 Latency over {stats['n']} trials - p50: {stats['p50']}s | p90: {stats['p90']}s | "
+                f"p99: {stats['p99']}s | mean: {stats['mean']}s ± {stats['stddev']}s | "
+                f"95% CI: [{stats['ci_low']}, {stats['ci_high']}]s"
+            )
+        if result.get("eval_time") is not None:
+            print(
+                f"🧮 Server timing - Load: {result['load_time']}s | Prompt eval: {result['prompt_eval_time']}s | "
+                f"Eval: {result['eval_time']}s"
+            )
+        if result.get("stream_metrics"):
+            sm = result["stream_metrics"]
+            print(
+                f"🚀 TTFT: {sm['ttft']} seconds | ITL p50/p90/p99: {sm['itl_p50']}/{sm['itl_p90']}/{sm['itl_p99']} ms | "
+                f"Decode: {sm['decode_tokens_per_sec']} tok/s"
+            )
         print(f"📝 Response Length: {result['length']} words")
         print(
             f"📚 Readability - Sentences: {result['readability']['sentence_count']} | "
@@ -131,3 +492,270 @@ def run_comparative_evaluation(providers_models: dict, prompts: dict, user_input
         print("\n" + "=" * 50)
 
     print("\n✅ All results have been logged to `llm_comparison.log`.")
+
+
+def preload_local_models(providers_models: dict, keep_alive=OLLAMA_KEEP_ALIVE,
+                         call_timeout: float = DEFAULT_CALL_TIMEOUT_SECONDS):
+    """
+    Load every Ollama/mock model in `providers_models` before measuring, through the
+    pooled client the measured calls use (same `call_timeout`). Failures are logged only.
+    """
+    for provider in ("ollama", "mock"):
+        for model in dict.fromkeys(providers_models.get(provider, ())):
+            try:
+                timing = preload_ollama_model(model, keep_alive, mock=provider == "mock", timeout=call_timeout)
+                logging.info(
+                    f"Preloaded {provider} ({model}) in {timing['wall_time']}s (model load: {timing['load_time']}s)"
+                )
+            except Exception as e:
+                logging.warning(f"Could not preload {provider} ({model}): {e}")
+
+
+def run_comparative_evaluation(providers_models: dict, prompts: dict, user_input: str,
+                               concurrent: bool = False, provider_limits: dict = None,
+                               max_workers: int = None, stream: bool = False,
+                               cache_mode: str = "off", warmup: int = 0, trials: int = 1,
+                               on_result=None, skip_cells: set = None, print_results: bool = True,
+                               rate_limits: dict = None, max_retries: int = MAX_RETRIES,
+                               run_id: str = None, store_results: bool = True,
+                               metrics_workers: int = None,
+                               call_timeout: float = DEFAULT_CALL_TIMEOUT_SECONDS,
+                               run_deadline: float = None, hedge_percentile: float = None,
+                               preload: bool = True, keep_alive=OLLAMA_KEEP_ALIVE,
+                               batch_scoring: bool = None, prompt_classifier: str = None) -> dict:
+    """
+    Run every provider x model x prompt cell and return the results keyed by
+    `{provider}_{model}_{prompt_name}`.
+
+    - `concurrent`: dispatch the whole matrix on a thread pool instead of one call at a time
+    - `provider_limits`: max in-flight calls per provider, overrides DEFAULT_PROVIDER_CONCURRENCY
+    - `max_workers`: thread pool size, defaults to the sum of the provider limits
+    - `stream`: use the streaming provider calls and record TTFT / inter-token latency
+    - `cache_mode`: one of utils.response_cache.CACHE_MODES; "replay" rebuilds every
+      metric from cached responses without calling any provider
+    - `warmup` / `trials`: discarded warmup calls and measured calls per cell; with
+      trials > 1 the cell reports p50/p90/p99, mean, stddev and a 95% CI of its latency
+    - `on_result`: called as `on_result(key, result)` as soon as each cell finishes
+    - `skip_cells`: cell keys to leave out, e.g. ones already completed by a resumed batch
+    - `print_results`: print the full per-cell summary at the end
+    - `rate_limits`: per-provider {"rate", "burst"} overrides for utils.rate_limiter.DEFAULT_RATE_LIMITS
+    - `max_retries`: retries per call on 429s and transient server errors (jittered exponential backoff)
+    - `run_id` / `store_results`: every record is appended to utils.results_store under `run_id`
+      (a new run is started when None) and carries it as `result["run_id"]`
+    - `metrics_workers`: processes scoring responses (output tokens + readability) in the
+      background, defaults to utils.metrics_pool.DEFAULT_METRICS_WORKERS; 0 scores inline
+    - `call_timeout`: seconds one provider call may take before it is abandoned (None = no limit)
+    - `run_deadline`: seconds the whole run may take; calls still queued at that point are
+      cancelled and calls in flight are cut off, all recorded with `timed_out`
+    - `hedge_percentile`: e.g. 95 - once a provider/model has some latency history, a call
+      still running past that percentile gets a duplicate request and the first answer is
+      kept; such cells are flagged `hedged` (and `hedge_won` when the duplicate won)
+    - `preload`: load every Ollama/mock model before the first measured call, so no cell
+      pays the model load from disk; load time is still recorded per cell as `load_time`
+    - `keep_alive`: how long Ollama keeps the models loaded (see utils.llms.OLLAMA_KEEP_ALIVE)
+    - `batch_scoring`: score all responses together once the calls are done (one nlp.pipe
+      pass per worker) instead of cell by cell; defaults to on for "replay", where every
+      response is available at once
+    - `prompt_classifier`: "keywords" or "embedding" (see comparision_tools.prompt_classifier),
+      defaults to PROMPT_CLASSIFIER_MODE
+    """
+    if cache_mode not in CACHE_MODES:
+        raise ValueError(f"Unknown cache mode: {cache_mode}")
+    if rate_limits:
+        configure_rate_limits(rate_limits)
+
+    cells = [
+        (provider, model, prompt_name, prompt)
+        for provider, models in providers_models.items()
+        for model in models
+        for prompt_name, prompt in prompts.items()
+        if f"{provider}_{model}_{prompt_name}" not in (skip_cells or ())
+    ]
+    results = {}
+    deadline = time.monotonic() + run_deadline if run_deadline is not None else None
+    # Every prompt is classified once, in one batch (a single encode in embedding mode),
+    # and the cells look their label up
+    prompt_texts = list(dict.fromkeys(prompts.values()))
+    prompt_types = dict(zip(prompt_texts, classify_prompts(prompt_texts, prompt_classifier)))
+    cell_args = (
+        stream, cache_mode, warmup, trials, max_retries, call_timeout, deadline, hedge_percentile, keep_alive,
+        prompt_types,
+    )
+
+    if store_results and run_id is None:
+        run_id = start_run(user_input, {
+            "providers_models": providers_models, "prompts": list(prompts), "concurrent": concurrent,
+            "stream": stream, "cache_mode": cache_mode, "warmup": warmup, "trials": trials,
+            "call_timeout": call_timeout, "run_deadline": run_deadline, "hedge_percentile": hedge_percentile,
+        })
+
+    def finish(key, result):
+        result["run_id"] = run_id
+        results[key] = result
+        if store_results:
+            record_result(run_id, result, question=user_input)
+        if on_result is not None:
+            on_result(key, result)
+
+    # Responses are scored on the metrics pool while the dispatcher keeps querying;
+    # scores are joined back to their cell by key as they complete
+    if metrics_workers is None:
+        metrics_workers = DEFAULT_METRICS_WORKERS
+    metrics_pool = get_metrics_pool(metrics_workers) if metrics_workers > 0 else None
+    if batch_scoring is None:
+        batch_scoring = cache_mode == "replay"
+    scoring = {}
+    unscored = []
+
+    def score(key, queried, error):
+        nonlocal metrics_pool
+        if error is not None:
+            finish(key, error)
+        elif queried["readability"] is not None and queried["output_tokens"] is not None:
+            # Parsed while streaming, token count from the provider: nothing left to compute
+            finish(key, _finalize_cell(queried, queried["output_tokens"], queried["readability"]))
+        elif batch_scoring:
+            unscored.append((key, queried))
+        elif metrics_pool is not None:
+            try:
+                future = metrics_pool.submit(
+                    score_response, queried["response"], queried["output_tokens"], queried["model"], queried["readability"]
+                )
+            except BrokenProcessPool:
+                # A worker died; score inline for the rest of the run
+                metrics_pool = None
+                join(key, queried, None)
+            else:
+                scoring[future] = (key, queried)
+        else:
+            join(key, queried, None)
+
+    def join(key, queried, future):
+        try:
+            try:
+                if future is None:
+                    scores = score_response(queried["response"], queried["output_tokens"], queried["model"], queried["readability"])
+                else:
+                    scores = future.result()
+            except BrokenProcessPool:
+                scores = score_response(queried["response"], queried["output_tokens"], queried["model"], queried["readability"])
+            finish(key, _finalize_cell(queried, *scores))
+        except Exception as e:
+            finish(key, _cell_error(queried["provider"], queried["model"], queried["prompt_name"], e))
+
+    def join_done(futures):
+        for future in futures:
+            if future in scoring:
+                join(*scoring.pop(future), future)
+
+    def submit_batch(batch):
+        nonlocal metrics_pool
+        if metrics_pool is None:
+            return None
+        try:
+            return metrics_pool.submit(score_responses, *batch)
+        except BrokenProcessPool:
+            metrics_pool = None
+            return None
+
+    def score_batches():
+        # One chunk per worker; each chunk is tokenized and parsed in a single pass
+        chunk_size = -(-len(unscored) // max(1, metrics_workers))
+        chunks = [unscored[i:i + chunk_size] for i in range(0, len(unscored), chunk_size)]
+        batches = [
+            ([queried["response"] for _, queried in chunk], [queried["output_tokens"] for _, queried in chunk],
+             [queried["model"] for _, queried in chunk])
+            for chunk in chunks
+        ]
+        futures = [submit_batch(batch) for batch in batches]
+        for i, chunk in enumerate(chunks):
+            try:
+                try:
+                    scored = futures[i].result() if futures[i] is not None else score_responses(*batches[i])
+                except BrokenProcessPool:
+                    scored = score_responses(*batches[i])
+            except Exception as e:
+                for key, queried in chunk:
+                    finish(key, _cell_error(queried["provider"], queried["model"], queried["prompt_name"], e))
+                continue
+            for (key, queried), scores in zip(chunk, scored):
+                finish(key, _finalize_cell(queried, *scores))
+
+    # Load local models up front so the first measured cell does not pay the load from disk
+    if preload and cache_mode != "replay":
+        cell_models = {}
+        for provider, model, _, _ in cells:
+            cell_models.setdefault(provider, []).append(model)
+        preload_local_models(cell_models, keep_alive, call_timeout)
+
+    # Pre-seed the keys so results keep matrix order regardless of completion order
+    for provider, model, prompt_name, _ in cells:
+        results[f"{provider}_{model}_{prompt_name}"] = None
+
+    if not concurrent:
+        for provider, model, prompt_name, prompt in cells:
+            score(f"{provider}_{model}_{prompt_name}", *_dispatch_cell(
+                provider, model, prompt_name, prompt, user_input, None, *cell_args
+            ))
+            join_done([future for future in scoring if future.done()])
+        while scoring:
+            done, _ = wait(list(scoring), return_when=FIRST_COMPLETED)
+            join_done(done)
+    else:
+        limits = {**DEFAULT_PROVIDER_CONCURRENCY, **(provider_limits or {})}
+        semaphores = {
+            provider: threading.Semaphore(max(1, limits.get(provider, 1)))
+            for provider in providers_models
+        }
+        if max_workers is None:
+            max_workers = sum(max(1, limits.get(provider, 1)) for provider in providers_models)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            queries = {
+                executor.submit(
+                    _dispatch_cell, provider, model, prompt_name, prompt, user_input,
+                    semaphores[provider], *cell_args
+                ): (f"{provider}_{model}_{prompt_name}", provider, model, prompt_name)
+                for provider, model, prompt_name, prompt in cells
+            }
+            outstanding = set(queries)
+            while outstanding or scoring:
+                left = remaining_time(deadline)
+                if left is not None and left <= 0 and outstanding:
+                    # Calls that have not started are cancelled (once); running ones are
+                    # bounded by the deadline through their call timeout and finish on their own
+                    for future in list(outstanding):
+                        if future.cancel():
+                            outstanding.discard(future)
+                            key, provider, model, prompt_name = queries[future]
+                            finish(key, _cell_error(provider, model, prompt_name,
+                                                    RunDeadlineExceeded("cancelled: run deadline exceeded")))
+                    deadline = None
+                    continue
+                done, _ = wait(outstanding | set(scoring), timeout=left if outstanding else None,
+                               return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in outstanding:
+                        outstanding.discard(future)
+                        score(queries[future][0], *future.result())
+                join_done(done)
+
+    if unscored:
+        score_batches()
+
+    if cache_mode != "off":
+        prune_cache()
+
+    pool = client_pool_stats()
+    logging.info(
+        f"Client pool - Created: {pool['created']} | Reused: {pool['reused']} | "
+        f"Avg setup: {pool['avg_setup_ms']} ms | Setup time saved: {pool['saved_seconds']}s"
+    )
+
+    if print_results:
+        _print_results(results)
+        print(
+            f"♻️ Provider clients reused {pool['reused']} times "
+            f"(~{pool['saved_seconds']}s of client setup avoided, {pool['avg_setup_ms']} ms per client)."
+        )
+    return results
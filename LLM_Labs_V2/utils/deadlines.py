@@ -0,0 +1,106 @@
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from comparision_tools.latency import percentile
+
+# Wall-clock limit for one provider call (None = wait forever). Also handed to the
+# SDKs as their HTTP timeout so an abandoned call releases its connection.
+DEFAULT_CALL_TIMEOUT_SECONDS = 300
+
+# Hedging: once a provider/model has this many recorded latencies, a call still
+# running past their `hedge_percentile` gets a duplicate and the first answer wins
+HEDGE_MIN_SAMPLES = 5
+LATENCY_HISTORY_SIZE = 200
+
+# Calls run on these threads when they need a deadline or a hedge; a hung call
+# cannot be killed, so its thread is abandoned until the SDK timeout ends it
+CALL_THREADS = 64
+
+
+class CallTimeout(TimeoutError):
+    """A provider call did not finish within its deadline."""
+
+
+class RunDeadlineExceeded(CallTimeout):
+    """The run's overall deadline passed before the call could start or finish."""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_latency_history = {}
+_history_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=CALL_THREADS, thread_name_prefix="llm-call")
+        return _executor
+
+
+def record_latency(provider: str, model: str, seconds: float):
+    with _history_lock:
+        _latency_history.setdefault((provider, model), deque(maxlen=LATENCY_HISTORY_SIZE)).append(seconds)
+
+
+def hedge_threshold(provider: str, model: str, pct: float) -> float | None:
+    """Seconds after which to hedge a call, or None while there is too little history."""
+    with _history_lock:
+        samples = list(_latency_history.get((provider, model), ()))
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return percentile(samples, pct)
+
+
+def remaining_time(deadline: float | None) -> float | None:
+    """Seconds left until a time.monotonic() deadline, None if there is none."""
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_with_deadline(fn, timeout: float = None, hedge_after: float = None, can_hedge=None):
+    """
+    Run `fn()` and return (result, {"hedged", "hedge_won"}).
+
+    - `timeout`: raise CallTimeout if no answer arrives within this many seconds
+    - `hedge_after`: if the call is still running after this many seconds, start a
+      duplicate (when `can_hedge()` allows it, e.g. a rate-limit token is free) and
+      keep whichever finishes first; the other is abandoned
+    Without a timeout or hedge the call runs on the current thread, unchanged.
+    """
+    flags = {"hedged": False, "hedge_won": False}
+    if timeout is None and hedge_after is None:
+        return fn(), flags
+
+    start = time.monotonic()
+    executor = _get_executor()
+    primary = executor.submit(fn)
+    futures = [primary]
+
+    if hedge_after is not None and (timeout is None or hedge_after < timeout):
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done and (can_hedge is None or can_hedge()):
+            futures.append(executor.submit(fn))
+            flags["hedged"] = True
+
+    while True:
+        pending = [future for future in futures if not future.done()]
+        finished = [future for future in futures if future.done()]
+        # First successful answer wins; an error only counts once nothing else is left
+        for future in finished:
+            if future.exception() is None:
+                flags["hedge_won"] = future is not primary
+                for other in pending:
+                    other.cancel()
+                return future.result(), flags
+        if not pending:
+            raise finished[0].exception()
+
+        left = None if timeout is None else timeout - (time.monotonic() - start)
+        if left is not None and left <= 0:
+            for future in pending:
+                future.cancel()
+            raise CallTimeout(f"no response within {timeout:.3g}s")
+        wait(pending, timeout=left, return_when=FIRST_COMPLETED)
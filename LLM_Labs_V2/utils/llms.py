@@ -1,32 +1,295 @@
 import os
-from groq import Groq
-import google.generativeai as genai
-from ollama import Client as OllamaClient
+import time
+import threading
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 
+# The provider SDKs are imported when their first client is created, so starting
+# the app (or using one provider) does not pay for all of them
+if TYPE_CHECKING:
+    import httpx
+    from groq import Groq
+    from ollama import Client as OllamaClient
+
 load_dotenv()
 
-def query_groq_llm(user_input: str, model: str, prompt: str) -> str:
-    client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+# How long idle HTTP connections are kept open for reuse between calls
+KEEPALIVE_SECONDS = 120
+MAX_CONNECTIONS = 20
+
+# How long Ollama keeps a model loaded after a call: a duration string ("10m"),
+# seconds, or -1 to keep it resident. Keeps later calls from paying the load again.
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "10m")
+
+# Local stand-in server (utils/mock_llm_server.py) used by the "mock" provider for offline benchmarks
+MOCK_LLM_HOST = os.getenv("MOCK_LLM_HOST", "http://127.0.0.1:11435")
+
+# One long-lived client per provider (and per model for Gemini), created on first use
+_clients = {}
+_clients_lock = threading.Lock()
+_client_stats = {"created": 0, "reused": 0, "setup_seconds": 0.0}
+_gemini_configured = False
+
+
+def _http_limits() -> "httpx.Limits":
+    import httpx
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_CONNECTIONS,
+        keepalive_expiry=KEEPALIVE_SECONDS
+    )
+
+
+def _get_client(key: tuple, factory):
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is not None:
+            _client_stats["reused"] += 1
+            return client
+        start = time.perf_counter()
+        client = factory()
+        _client_stats["setup_seconds"] += time.perf_counter() - start
+        _client_stats["created"] += 1
+        _clients[key] = client
+        return client
+
+
+def get_groq_client() -> "Groq":
+    # SDK-level retries are disabled: utils/rate_limiter.py retries so that backoff
+    # time is reported separately instead of being folded into response_time
+    def factory():
+        import httpx
+        from groq import Groq
+        return Groq(
+            api_key=os.getenv("GROQ_API_KEY"),
+            http_client=httpx.Client(limits=_http_limits()),
+            max_retries=0
+        )
+    return _get_client(("groq",), factory)
+
+
+def get_gemini_model(model: str):
+    def factory():
+        global _gemini_configured
+        import google.generativeai as genai
+        if not _gemini_configured:
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            _gemini_configured = True
+        return genai.GenerativeModel(model)
+    return _get_client(("gemini", model), factory)
+
+
+def _ollama_client(**kwargs) -> "OllamaClient":
+    from ollama import Client as OllamaClient
+    return OllamaClient(limits=_http_limits(), **kwargs)
+
+
+def get_ollama_client(timeout: float = None) -> "OllamaClient":
+    # The Ollama client only takes a timeout at construction, so there is one client per
+    # timeout; callers pass a fixed timeout (not one shrinking with a deadline) to keep reuse
+    return _get_client(("ollama", timeout), lambda: _ollama_client(timeout=timeout))
+
+
+def get_mock_client(timeout: float = None) -> "OllamaClient":
+    # The mock server speaks the Ollama API, so the Ollama client drives it unchanged
+    return _get_client(
+        ("mock", MOCK_LLM_HOST, timeout),
+        lambda: _ollama_client(host=MOCK_LLM_HOST, timeout=timeout)
+    )
+
+
+def client_pool_stats() -> dict:
+    """
+    Summarize the client registry:
+    - `created` / `reused`: client constructions vs cache hits
+    - `avg_setup_ms`: mean cost of building one client
+    - `saved_seconds`: setup time avoided by reusing clients (reused x avg setup);
+      reused keep-alive connections additionally skip the TCP/TLS handshake,
+      which shows up as lower `response_time` on every call after the first
+    """
+    with _clients_lock:
+        created = _client_stats["created"]
+        reused = _client_stats["reused"]
+        setup_seconds = _client_stats["setup_seconds"]
+    avg_setup = setup_seconds / created if created else 0.0
+    return {
+        "created": created,
+        "reused": reused,
+        "avg_setup_ms": round(avg_setup * 1000, 3),
+        "saved_seconds": round(reused * avg_setup, 3),
+    }
+
+
+def close_clients():
+    """Close pooled HTTP connections and forget all cached clients."""
+    global _gemini_configured
+    with _clients_lock:
+        for client in _clients.values():
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
+        _clients.clear()
+        _gemini_configured = False
+
+
+def _groq_timeout(timeout: float = None) -> dict:
+    # Groq treats an explicit timeout=None as "never time out", so only pass a real value
+    return {"timeout": timeout} if timeout else {}
+
+def _gemini_timeout(timeout: float = None) -> dict:
+    return {"request_options": {"timeout": timeout}} if timeout else {}
+
+def groq_usage(usage) -> dict:
+    """Token counts from a Groq (OpenAI-style) `usage` object; empty if missing."""
+    if usage is None:
+        return {}
+    return {"prompt_tokens": usage.prompt_tokens, "completion_tokens": usage.completion_tokens}
+
+def gemini_usage(usage_metadata) -> dict:
+    """Token counts from Gemini's `usage_metadata`; empty if missing."""
+    if usage_metadata is None or not getattr(usage_metadata, "prompt_token_count", None):
+        return {}
+    return {
+        "prompt_tokens": usage_metadata.prompt_token_count,
+        "completion_tokens": getattr(usage_metadata, "candidates_token_count", None),
+    }
+
+def query_groq_llm(user_input: str, model: str, prompt: str, timeout: float = None,
+                   return_meta: bool = False):
+    """Query Groq. With `return_meta` returns (text, groq_usage(...)) with the provider's token counts."""
+    client = get_groq_client()
     full_prompt = prompt + "\n" + user_input
     response = client.chat.completions.create(
         model=model,
-        messages=[{"role": "user", "content": full_prompt}]
+        messages=[{"role": "user", "content": full_prompt}],
+        **_groq_timeout(timeout)
     )
-    return response.choices[0].message.content.strip()
+    text = response.choices[0].message.content.strip()
+    return (text, groq_usage(getattr(response, "usage", None))) if return_meta else text
 
-def query_gemini_llm(user_input: str, model: str, prompt: str) -> str:
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    model = genai.GenerativeModel(model)
+def query_gemini_llm(user_input: str, model: str, prompt: str, timeout: float = None,
+                     return_meta: bool = False):
+    """Query Gemini. With `return_meta` returns (text, gemini_usage(...)) with the provider's token counts."""
+    model = get_gemini_model(model)
     full_prompt = prompt + "\n" + user_input
-    response = model.generate_content(full_prompt)
-    return response.text.strip()
+    response = model.generate_content(full_prompt, **_gemini_timeout(timeout))
+    text = response.text.strip()
+    return (text, gemini_usage(getattr(response, "usage_metadata", None))) if return_meta else text
 
-def query_ollama_llm(user_input: str, model: str, prompt: str) -> str:
-    client = OllamaClient()
+def query_ollama_llm(user_input: str, model: str, prompt: str, timeout: float = None,
+                     keep_alive=OLLAMA_KEEP_ALIVE, return_meta: bool = False):
+    """
+    Query a local Ollama model. With `return_meta` returns (text, ollama_timings(...))
+    so load, prefill and decode time can be recorded apart from wall-clock time.
+    """
+    return _query_ollama_api(get_ollama_client(timeout), user_input, model, prompt, keep_alive, return_meta)
+
+def query_mock_llm(user_input: str, model: str, prompt: str, timeout: float = None,
+                   keep_alive=OLLAMA_KEEP_ALIVE, return_meta: bool = False):
+    return _query_ollama_api(get_mock_client(timeout), user_input, model, prompt, keep_alive, return_meta)
+
+def _query_ollama_api(client: "OllamaClient", user_input: str, model: str, prompt: str,
+                      keep_alive=OLLAMA_KEEP_ALIVE, return_meta: bool = False):
     full_prompt = prompt + "\n" + user_input
     response = client.chat(
         model=model,
-        messages=[{"role": "user", "content": full_prompt}]
+        messages=[{"role": "user", "content": full_prompt}],
+        keep_alive=keep_alive
+    )
+    text = response['message']['content'].strip()
+    return (text, ollama_timings(response)) if return_meta else text
+
+def ollama_timings(response) -> dict:
+    """Seconds spent loading the model, evaluating the prompt (prefill) and generating (decode), plus token counts."""
+    def seconds(key):
+        value = response.get(key)
+        return round(value / 1e9, 4) if value is not None else None
+    return {
+        "load_time": seconds("load_duration"),
+        "prompt_eval_time": seconds("prompt_eval_duration"),
+        "eval_time": seconds("eval_duration"),
+        "server_total_time": seconds("total_duration"),
+        "prompt_tokens": response.get("prompt_eval_count"),
+        "completion_tokens": response.get("eval_count"),
+    }
+
+def preload_ollama_model(model: str, keep_alive=OLLAMA_KEEP_ALIVE, mock: bool = False,
+                         timeout: float = None) -> dict:
+    """
+    Load `model` into memory ahead of the measured calls (an empty generate request)
+    and keep it there for `keep_alive`. Pass the measured calls' timeout, so the
+    preload goes through (and warms) the same pooled client and cannot hang forever.
+    Returns {"wall_time", "load_time"} in seconds.
+    """
+    client = get_mock_client(timeout) if mock else get_ollama_client(timeout)
+    start = time.perf_counter()
+    response = client.generate(model=model, prompt="", keep_alive=keep_alive)
+    return {"wall_time": round(time.perf_counter() - start, 4), "load_time": ollama_timings(response)["load_time"]}
+
+
+def stream_groq_llm(user_input: str, model: str, prompt: str, timeout: float = None, meta: dict = None):
+    """
+    Yield response text fragments from Groq as they arrive.
+    If a `meta` dict is passed it is filled with the token usage sent with the last chunk.
+    """
+    client = get_groq_client()
+    full_prompt = prompt + "\n" + user_input
+    stream = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": full_prompt}],
+        stream=True,
+        **_groq_timeout(timeout)
+    )
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+        if meta is not None:
+            # Groq attaches usage to the final chunk under `x_groq`
+            usage = getattr(chunk, "usage", None) or getattr(getattr(chunk, "x_groq", None), "usage", None)
+            if usage is not None:
+                meta.update(groq_usage(usage))
+
+def stream_gemini_llm(user_input: str, model: str, prompt: str, timeout: float = None, meta: dict = None):
+    """
+    Yield response text fragments from Gemini as they arrive.
+    If a `meta` dict is passed it is filled with the token usage of the finished response.
+    """
+    model = get_gemini_model(model)
+    full_prompt = prompt + "\n" + user_input
+    response = model.generate_content(full_prompt, stream=True, **_gemini_timeout(timeout))
+    for chunk in response:
+        if chunk.text:
+            yield chunk.text
+        if meta is not None:
+            meta.update(gemini_usage(getattr(chunk, "usage_metadata", None)))
+
+def stream_ollama_llm(user_input: str, model: str, prompt: str, timeout: float = None,
+                      keep_alive=OLLAMA_KEEP_ALIVE, meta: dict = None):
+    """
+    Yield response text fragments from a local Ollama model as they arrive.
+    If a `meta` dict is passed it is filled with ollama_timings(...) from the final chunk.
+    """
+    return _stream_ollama_api(get_ollama_client(timeout), user_input, model, prompt, keep_alive, meta)
+
+def stream_mock_llm(user_input: str, model: str, prompt: str, timeout: float = None,
+                    keep_alive=OLLAMA_KEEP_ALIVE, meta: dict = None):
+    """Yield response text fragments from the local mock server as they arrive."""
+    return _stream_ollama_api(get_mock_client(timeout), user_input, model, prompt, keep_alive, meta)
+
+def _stream_ollama_api(client: "OllamaClient", user_input: str, model: str, prompt: str,
+                       keep_alive=OLLAMA_KEEP_ALIVE, meta: dict = None):
+    full_prompt = prompt + "\n" + user_input
+    stream = client.chat(
+        model=model,
+        messages=[{"role": "user", "content": full_prompt}],
+        stream=True,
+        keep_alive=keep_alive
     )
-    return response['message']['content'].strip()
\ No newline at end of file
+    for chunk in stream:
+        if chunk['message']['content']:
+            yield chunk['message']['content']
+        if meta is not None and chunk.get('done'):
+            meta.update(ollama_timings(chunk))
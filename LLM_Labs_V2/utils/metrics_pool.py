@@ -0,0 +1,74 @@
+import os
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from comparision_tools.tokenizer import count_tokens, count_tokens_batch
+
+# Worker processes for the CPU-bound scoring (tokenizer + spaCy readability), so it
+# runs alongside the I/O-bound provider calls instead of between them. 0 scores inline.
+DEFAULT_METRICS_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def score_response(response: str, output_tokens: int = None, model: str = None,
+                   readability: dict = None) -> tuple[int, dict]:
+    """
+    Output token count (counted locally unless the provider reported it) and readability
+    metrics (computed unless already accumulated while the response streamed).
+    """
+    if output_tokens is None:
+        output_tokens = count_tokens(response, model)
+    if readability is None:
+        # spaCy and textstat are imported by the first scoring call, not at app start
+        from comparision_tools.metrics import get_readability_metrics
+        readability = get_readability_metrics(response)
+    return output_tokens, readability
+
+
+def score_responses(responses: list, output_tokens: list, models: list) -> list:
+    """score_response for many responses: one tokenizer call per model and one nlp.pipe pass."""
+    from comparision_tools.metrics import get_readability_metrics_batch
+    output_tokens = list(output_tokens)
+    missing = {}
+    for i, (tokens, model) in enumerate(zip(output_tokens, models)):
+        if tokens is None:
+            missing.setdefault(model, []).append(i)
+    for model, indices in missing.items():
+        counts = count_tokens_batch([responses[i] for i in indices], model)
+        for i, count in zip(indices, counts):
+            output_tokens[i] = count
+    return list(zip(output_tokens, get_readability_metrics_batch(responses)))
+
+
+def _warm_up():
+    # Load the tokenizer and spaCy model when the worker starts, not on its first response
+    score_response("Warm up.")
+
+
+def get_metrics_pool(workers: int = DEFAULT_METRICS_WORKERS) -> ProcessPoolExecutor:
+    """Shared scoring pool, created on first use and kept for later runs (e.g. every batch question)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        # A pool whose worker died stays broken; replace it rather than hand it out again
+        broken = _pool is not None and getattr(_pool, "_broken", False)
+        if _pool is None or _pool_workers != workers or broken:
+            if _pool is not None:
+                _pool.shutdown(wait=not broken)
+            _pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_up)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_metrics_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+        _pool, _pool_workers = None, 0
+
+
+atexit.register(shutdown_metrics_pool)
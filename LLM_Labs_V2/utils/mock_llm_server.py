@@ -0,0 +1,329 @@
+"""
+Local stand-in for the LLM providers, for offline harness benchmarking.
+
+Speaks enough of two HTTP APIs to drive the real SDK clients:
+- Ollama: GET /api/tags, POST /api/chat, POST /api/generate (NDJSON streaming)
+- OpenAI-compatible: POST /v1/chat/completions and /openai/v1/chat/completions (SSE streaming);
+  the Groq SDK can be pointed here with GROQ_BASE_URL=http://127.0.0.1:11435
+
+Responses are synthetic. Latency, token rate, response length and error injection
+are configurable, e.g.:
+
+    python -m utils.mock_llm_server --port 11435 --latency-dist lognormal \\
+        --latency-mean 0.4 --latency-std 0.2 --tokens-per-sec 80 --error-rate 0.05 --error-status 429
+"""
+import json
+import math
+import time
+import random
+import argparse
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 11435
+
+DEFAULT_CONFIG = {
+    "latency_dist": "fixed",      # fixed | uniform | normal | lognormal | exponential
+    "latency_mean": 0.2,          # seconds before the first token
+    "latency_std": 0.05,
+    "tokens_per_sec": 50.0,       # decode rate; 0 disables pacing
+    "min_tokens": 40,
+    "max_tokens": 120,
+    "error_rate": 0.0,            # fraction of requests answered with `error_status`
+    "error_status": 500,
+    "retry_after": 1,             # seconds, sent with 429/503 errors
+    "seed": None,
+}
+
+_WORDS = (
+    "the model answers clearly and the result depends on careful reasoning about each step "
+    "language systems generate tokens one at a time while evaluation measures speed quality and cost "
+    "a simple explanation often works better than complicated terminology for most readers"
+).split()
+
+logger = logging.getLogger(__name__)
+
+
+class _MockState:
+    def __init__(self, config: dict):
+        self.config = {**DEFAULT_CONFIG, **config}
+        self.rng = random.Random(self.config["seed"])
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+
+    def sample_latency(self) -> float:
+        c = self.config
+        mean, std = c["latency_mean"], c["latency_std"]
+        with self.lock:
+            dist = c["latency_dist"]
+            if dist == "uniform":
+                value = self.rng.uniform(max(0.0, mean - std), mean + std)
+            elif dist == "normal":
+                value = self.rng.gauss(mean, std)
+            elif dist == "lognormal":
+                # Parameterized so the samples have the requested mean and std
+                if mean > 0:
+                    sigma = math.sqrt(math.log1p((std / mean) ** 2))
+                    mu = math.log(mean) - sigma ** 2 / 2
+                    value = self.rng.lognormvariate(mu, sigma)
+                else:
+                    value = 0.0
+            elif dist == "exponential":
+                value = self.rng.expovariate(1 / mean) if mean > 0 else 0.0
+            else:
+                value = mean
+        return max(0.0, value)
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            fail = self.rng.random() < self.config["error_rate"]
+            if fail:
+                self.errors += 1
+            return fail
+
+    def synthetic_tokens(self) -> list:
+        with self.lock:
+            count = self.rng.randint(self.config["min_tokens"], max(self.config["min_tokens"], self.config["max_tokens"]))
+            words = [self.rng.choice(_WORDS) for _ in range(count)]
+        tokens = []
+        for i, word in enumerate(words):
+            if i % 12 == 0:
+                word = word.capitalize()
+            suffix = "." if i % 12 == 11 or i == count - 1 else ""
+            tokens.append(("" if i == 0 else " ") + word + suffix)
+        return tokens
+
+
+def _prompt_text(body: dict) -> str:
+    if "messages" in body:
+        return "\n".join(str(m.get("content", "")) for m in body["messages"])
+    return str(body.get("prompt", ""))
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real providers
+    state: _MockState = None
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # ---- plumbing -------------------------------------------------------
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b"{}"
+        try:
+            return json.loads(raw or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def _send_json(self, status: int, payload: dict, headers: dict = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_chunked(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _end_chunked(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _maybe_fail(self, openai_style: bool) -> bool:
+        if not self.state.should_fail():
+            return False
+        status = self.state.config["error_status"]
+        headers = {}
+        if status in (429, 503):
+            headers["Retry-After"] = str(self.state.config["retry_after"])
+        message = "rate limit exceeded (mock)" if status == 429 else "injected failure (mock)"
+        if openai_style:
+            payload = {"error": {"message": message, "type": "mock_error", "code": status}}
+        else:
+            payload = {"error": message}  # Ollama reports errors as a plain string
+        self._send_json(status, payload, headers)
+        return True
+
+    def _generate(self):
+        """Wait out the sampled latency (time to first token), then yield tokens at the configured rate."""
+        time.sleep(self.state.sample_latency())
+        rate = self.state.config["tokens_per_sec"]
+        interval = 1 / rate if rate and rate > 0 else 0.0
+        for token in self.state.synthetic_tokens():
+            yield token
+            if interval:
+                time.sleep(interval)
+
+    # ---- routes ---------------------------------------------------------
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            self._send_json(200, {"models": [{"name": "mock:latest", "model": "mock:latest", "size": 0}]})
+        elif self.path.rstrip("/") in ("/v1/models", "/openai/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        elif self.path.rstrip("/") == "/stats":
+            self._send_json(200, {"requests": self.state.requests, "errors": self.state.errors, "config": self.state.config})
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        body = self._read_json()
+        path = self.path.rstrip("/")
+        if path in ("/api/chat", "/api/generate"):
+            if not self._maybe_fail(openai_style=False):
+                self._ollama(body, chat=path == "/api/chat")
+        elif path in ("/v1/chat/completions", "/openai/v1/chat/completions"):
+            if not self._maybe_fail(openai_style=True):
+                self._openai(body)
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def _ollama(self, body: dict, chat: bool):
+        model = body.get("model", "mock")
+        prompt_tokens = len(_prompt_text(body).split())
+        # An empty /api/generate prompt is Ollama's "load the model" request
+        if not chat and not body.get("prompt"):
+            self._send_json(200, {"model": model, "response": "", "done": True, "load_duration": 0, "total_duration": 0})
+            return
+
+        start = time.perf_counter_ns()
+        first_token_at = None
+
+        def piece(text: str, done: bool) -> dict:
+            if chat:
+                return {"model": model, "message": {"role": "assistant", "content": text}, "done": done}
+            return {"model": model, "response": text, "done": done}
+
+        def final_stats(eval_count: int) -> dict:
+            end = time.perf_counter_ns()
+            prefill = (first_token_at or end) - start
+            return {
+                "done_reason": "stop",
+                "total_duration": end - start,
+                "load_duration": 0,
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": prefill,
+                "eval_count": eval_count,
+                "eval_duration": end - (first_token_at or end),
+            }
+
+        if body.get("stream", True):
+            self._start_chunked("application/x-ndjson")
+            count = 0
+            for token in self._generate():
+                if first_token_at is None:
+                    first_token_at = time.perf_counter_ns()
+                count += 1
+                self._write_chunk((json.dumps(piece(token, False)) + "\n").encode("utf-8"))
+            self._write_chunk((json.dumps({**piece("", True), **final_stats(count)}) + "\n").encode("utf-8"))
+            self._end_chunked()
+        else:
+            tokens = []
+            for token in self._generate():
+                if first_token_at is None:
+                    first_token_at = time.perf_counter_ns()
+                tokens.append(token)
+            self._send_json(200, {**piece("".join(tokens), True), **final_stats(len(tokens))})
+
+    def _openai(self, body: dict):
+        model = body.get("model", "mock")
+        prompt_tokens = len(_prompt_text(body).split())
+        completion_id = f"chatcmpl-mock-{time.time_ns()}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            self._start_chunked("text/event-stream")
+            count = 0
+            for token in self._generate():
+                count += 1
+                chunk = {
+                    "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+                }
+                self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            last = {
+                "id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": count, "total_tokens": prompt_tokens + count},
+            }
+            self._write_chunk(f"data: {json.dumps(last)}\n\n".encode("utf-8"))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._end_chunked()
+        else:
+            tokens = list(self._generate())
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(tokens),
+                    "total_tokens": prompt_tokens + len(tokens),
+                },
+            })
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **config) -> ThreadingHTTPServer:
+    """Build (but do not start) a mock server; `config` overrides DEFAULT_CONFIG keys."""
+    handler = type("ConfiguredMockLLMHandler", (MockLLMHandler,), {"state": _MockState(config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_background(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, **config) -> ThreadingHTTPServer:
+    """Start a mock server on a daemon thread (port 0 picks a free port); call `.shutdown()` to stop it."""
+    server = create_server(host, port, **config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Ollama / OpenAI-compatible LLM server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "normal", "lognormal", "exponential"],
+                        default=DEFAULT_CONFIG["latency_dist"])
+    parser.add_argument("--latency-mean", type=float, default=DEFAULT_CONFIG["latency_mean"])
+    parser.add_argument("--latency-std", type=float, default=DEFAULT_CONFIG["latency_std"])
+    parser.add_argument("--tokens-per-sec", type=float, default=DEFAULT_CONFIG["tokens_per_sec"])
+    parser.add_argument("--min-tokens", type=int, default=DEFAULT_CONFIG["min_tokens"])
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_CONFIG["max_tokens"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"])
+    parser.add_argument("--error-status", type=int, default=DEFAULT_CONFIG["error_status"])
+    parser.add_argument("--retry-after", type=int, default=DEFAULT_CONFIG["retry_after"])
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = {k: v for k, v in vars(args).items() if k not in ("host", "port")}
+    server = create_server(args.host, args.port, **config)
+    print(f"🧪 Mock LLM server listening on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping mock server.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+# Starting request rate (requests/sec) and burst size per provider; each
+# provider/model pair gets its own bucket. None means no client-side limit,
+# but 429s are still retried with backoff.
+DEFAULT_RATE_LIMITS = {
+    "groq": {"rate": 0.5, "burst": 5},     # ~30 requests/minute
+    "gemini": {"rate": 0.25, "burst": 3},  # ~15 requests/minute
+    "ollama": None,
+    "mock": None,
+}
+
+# Retry policy for rate-limited and transient server errors
+MAX_RETRIES = 4
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire()` blocks until a token is free and returns the seconds waited."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = max(self.blocked_until - now, (1 - self.tokens) / self.rate if self.rate > 0 else 1.0)
+            time.sleep(delay)
+            waited += delay
+
+    def try_acquire(self) -> bool:
+        """Take a token only if one is free right now."""
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self.blocked_until and self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def pause(self, seconds: float):
+        """Hold every caller back for `seconds`, e.g. after a Retry-After."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose rate follows AIMD: each success nudges the rate up
+    (capped at `max_rate`), each 429 halves it (floored at `min_rate`) and
+    honours Retry-After by pausing the bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, max_rate: float = None, min_rate: float = None,
+                 increase: float = None):
+        self.max_rate = max_rate or rate * 2
+        self.min_rate = min_rate or rate / 16
+        self.increase = increase or rate / 20
+        self.bucket = TokenBucket(rate, burst)
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def acquire(self) -> float:
+        return self.bucket.acquire()
+
+    def try_acquire(self) -> bool:
+        return self.bucket.try_acquire()
+
+    def on_success(self):
+        with self.bucket.lock:
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.increase)
+
+    def on_throttle(self, retry_after: float = None):
+        with self.bucket.lock:
+            self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+        if retry_after:
+            self.bucket.pause(retry_after)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+_rate_limits = dict(DEFAULT_RATE_LIMITS)
+
+
+def configure_rate_limits(limits: dict):
+    """Override per-provider limits ({provider: {"rate", "burst"} or None}); resets existing buckets."""
+    with _limiters_lock:
+        _rate_limits.update(limits)
+        _limiters.clear()
+
+
+def get_limiter(provider: str, model: str) -> AdaptiveRateLimiter | None:
+    config = _rate_limits.get(provider)
+    if not config:
+        return None
+    with _limiters_lock:
+        limiter = _limiters.get((provider, model))
+        if limiter is None:
+            limiter = AdaptiveRateLimiter(config["rate"], config.get("burst", 1), config.get("max_rate"))
+            _limiters[(provider, model)] = limiter
+        return limiter
+
+
+def _status_code(error: Exception) -> int | None:
+    # Groq/httpx and Ollama expose `status_code`; google.api_core exposes `code`
+    for attr in ("status_code", "code", "http_status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+# SDK rate-limit exceptions (groq.RateLimitError, google.api_core ResourceExhausted),
+# matched by class name so the SDKs need not be imported here
+_RATE_LIMIT_ERROR_TYPES = {"RateLimitError", "ResourceExhausted", "TooManyRequests"}
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    # Decided from the status code or exception type only: message text such as a
+    # "4.29s" timeout must not count as a 429
+    if _status_code(error) == 429:
+        return True
+    return any(cls.__name__ in _RATE_LIMIT_ERROR_TYPES for cls in type(error).__mro__)
+
+
+def is_retryable_error(error: Exception) -> bool:
+    return is_rate_limit_error(error) or _status_code(error) in RETRYABLE_STATUS
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Read a Retry-After header (seconds or HTTP date) from the error's HTTP response, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = BASE_BACKOFF_SECONDS, cap: float = MAX_BACKOFF_SECONDS) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def call_with_retry(fn, provider: str, model: str, max_retries: int = MAX_RETRIES):
+    """
+    Run `fn()` behind the provider/model limiter, retrying rate-limited and
+    transient failures with jittered exponential backoff.
+    Returns (result, {"retries", "throttle_wait"}); `throttle_wait` covers
+    limiter waits and backoff sleeps, never the calls themselves. When retries
+    run out the last error is raised with that dict attached as `retry_info`.
+    """
+    limiter = get_limiter(provider, model)
+    info = {"retries": 0, "throttle_wait": 0.0}
+    attempt = 0
+
+    while True:
+        if limiter is not None:
+            info["throttle_wait"] += limiter.acquire()
+        try:
+            result = fn()
+        except Exception as e:
+            if not is_retryable_error(e) or attempt >= max_retries:
+                info["throttle_wait"] = round(info["throttle_wait"], 3)
+                e.retry_info = info
+                raise
+
+            retry_after = retry_after_seconds(e)
+            if is_rate_limit_error(e) and limiter is not None:
+                limiter.on_throttle(retry_after)
+            delay = max(retry_after or 0.0, backoff_delay(attempt))
+            logging.warning(
+                f"{provider} ({model}) attempt {attempt + 1} failed ({e}); retrying in {delay:.2f}s"
+                + (f", limiter now {limiter.rate:.3f} req/s" if limiter is not None else "")
+            )
+            time.sleep(delay)
+            info["throttle_wait"] += delay
+            info["retries"] += 1
+            attempt += 1
+            continue
+
+        if limiter is not None:
+            limiter.on_success()
+        info["throttle_wait"] = round(info["throttle_wait"], 3)
+        return result, info
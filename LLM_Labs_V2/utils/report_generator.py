@@ -1,11 +1,33 @@
 import re
 import os
+import json
 from datetime import datetime
 from utils.llms import query_gemini_llm
+from comparision_tools.latency import t_critical
+from utils.response_cache import make_cache_key, cache_get, cache_put
+from utils.results_store import fetch_results, latest_run_id
 
 LOG_FILE = "llm_comparison.log"
 REPORT_FILE = f"llm_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
 
+# Summary-record fields aggregated per provider::model as float columns (NaN when missing or "N/A")
+NUMERIC_FIELDS = [
+    "input_tokens", "output_tokens", "response_time", "retries", "throttle_wait",
+    "load_time", "prompt_eval_time", "eval_time", "output_tps", "prompt_tps",
+    "ttft", "itl_p50", "decode_tps",
+]
+# Output throughput timing bases (see utils.comparison._throughput); rates are only
+# compared within one basis, since each times a different part of the call
+THROUGHPUT_BASES = {
+    "server": "Ollama's own eval time, no network or model load",
+    "stream": "decode time after the first streamed token",
+    "wall": "whole response time, network and prefill included",
+}
+READABILITY_FIELDS = [
+    "flesch_score", "smog_index", "coleman_liau_index", "gunning_fog_index", "ari_index",
+    "dale_chall", "forcast", "linsear_write", "lix", "rix",
+]
+
 def safe_float(value: str):
     """Convert metric to float if possible, else return None."""
     try:
@@ -14,72 +36,340 @@ def safe_float(value: str):
         return None
 
 
-def extract_log_metrics():
-    if not os.path.exists(LOG_FILE):
+def load_run_metrics(run_id: str = None, provider: str = None, model: str = None) -> list:
+    """
+    Summary records for one run (the latest by default) from utils.results_store,
+    optionally narrowed to a provider and/or model. Same shape as extract_log_metrics.
+    """
+    run_id = run_id or latest_run_id()
+    if run_id is None:
+        raise LookupError("No stored runs found. Ensure comparison ran successfully.")
+    return fetch_results(run_id=run_id, provider=provider, model=model)
+
+
+# Byte offset already parsed, so each report only parses new log entries; the parsed
+# records are appended to a JSONL file next to the state file rather than rewritten
+LOG_STATE_FILE = LOG_FILE + ".state.json"
+LOG_ENTRY_SEPARATOR = b"-" * 50
+_LOG_HEAD_BYTES = 256
+
+# Compiled once; required fields drop the entry when missing, optional ones default
+_NUMBER = r"([\d\.NA\-]+)"
+_REQUIRED_PATTERNS = {
+    "provider": re.compile(r"Provider: (\w+)"),
+    "model": re.compile(r"Model: ([\w\-\.:]+)"),
+    "prompt": re.compile(r"Prompt: ([\w_]+)"),
+    "prompt_type": re.compile(r"Prompt Type: ([\w\s]+)"),
+    "tokens": re.compile(r"Tokens \(Input/Output/Total\): (\d+)/(\d+)/(\d+)"),
+    "response_time": re.compile(r"Response Time: ([\d\.]+)s"),
+    "flesch_score": re.compile(r"Flesch Score: " + _NUMBER),
+    "smog_index": re.compile(r"SMOG Index: " + _NUMBER),
+    "coleman_liau_index": re.compile(r"Coleman-Liau Index: " + _NUMBER),
+    "gunning_fog_index": re.compile(r"Gunning Fog Index: " + _NUMBER),
+    "ari_index": re.compile(r"Automated Readability Index: " + _NUMBER),
+    "dale_chall": re.compile(r"Dale-Chall: " + _NUMBER),
+    "forcast": re.compile(r"FORCAST: " + _NUMBER),
+    "linsear_write": re.compile(r"Linsear Write: " + _NUMBER),
+    "lix": re.compile(r"LIX: " + _NUMBER),
+    "rix": re.compile(r"RIX: " + _NUMBER),
+}
+# Streaming metrics are only logged for streamed runs, retries only when they happened
+# and latency samples only for repeated-trial runs
+_TTFT_PATTERN = re.compile(r"TTFT: ([\d\.]+)s")
+_ITL_PATTERN = re.compile(r"ITL p50/p90/p99: ([\d\.]+)/")
+_DECODE_PATTERN = re.compile(r"Decode: ([\d\.]+) tok/s")
+_THROTTLE_PATTERN = re.compile(r"Retries: (\d+) \| Throttle Wait: ([\d\.]+)s")
+_SAMPLES_PATTERN = re.compile(r"Latency Samples: ([\d\., ]+)")
+_THROUGHPUT_PATTERN = re.compile(
+    r"Throughput - Output: ([\d\.]+) tok/s \| Prompt: ([\d\.]+|None) tok/s \| Basis: (\w+)"
+)
+_TOKEN_SOURCE_PATTERN = re.compile(r"Tokens \(Input/Output/Total\): [\d/]+ \| Source: (\w+)")
+_SERVER_TIMING_PATTERN = re.compile(
+    r"Server Timing - Load: ([\d\.]+|None)s \| Prompt Eval: ([\d\.]+|None)s \| Eval: ([\d\.]+)s"
+)
+
+
+def parse_log_entry(entry: str) -> dict | None:
+    """Summary record for one logged result, or None if the entry is incomplete."""
+    matches = {}
+    for field, pattern in _REQUIRED_PATTERNS.items():
+        match = pattern.search(entry)
+        if match is None:
+            return None
+        matches[field] = match
+
+    input_tokens, output_tokens, total_tokens = map(int, matches.pop("tokens").groups())
+    response_time = float(matches.pop("response_time").group(1))
+    ttft = _TTFT_PATTERN.search(entry)
+    itl_p50 = _ITL_PATTERN.search(entry)
+    decode_tps = _DECODE_PATTERN.search(entry)
+    throttle = _THROTTLE_PATTERN.search(entry)
+    samples = _SAMPLES_PATTERN.search(entry)
+    server_timing = _SERVER_TIMING_PATTERN.search(entry)
+    token_source = _TOKEN_SOURCE_PATTERN.search(entry)
+    throughput = _THROUGHPUT_PATTERN.search(entry)
+
+    record = {field: match.group(1) for field, match in matches.items()}
+    record.update({
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "total_tokens": total_tokens,
+        "token_source": token_source.group(1) if token_source else "local",
+        "response_time": response_time,
+        "ttft": float(ttft.group(1)) if ttft else None,
+        "itl_p50": float(itl_p50.group(1)) if itl_p50 else None,
+        "decode_tps": float(decode_tps.group(1)) if decode_tps else None,
+        "latency_samples": (
+            [float(x) for x in samples.group(1).split(",") if x.strip()] if samples else [response_time]
+        ),
+        "retries": int(throttle.group(1)) if throttle else 0,
+        "throttle_wait": float(throttle.group(2)) if throttle else 0.0,
+        "load_time": safe_float(server_timing.group(1)) if server_timing else None,
+        "prompt_eval_time": safe_float(server_timing.group(2)) if server_timing else None,
+        "eval_time": safe_float(server_timing.group(3)) if server_timing else None,
+        "output_tps": safe_float(throughput.group(1)) if throughput else None,
+        "prompt_tps": safe_float(throughput.group(2)) if throughput else None,
+        "throughput_basis": throughput.group(3) if throughput else None,
+    })
+    return record
+
+
+def _parse_log_from(f, offset: int) -> tuple:
+    """
+    Stream entries from byte `offset`, one line at a time. Returns (records, new_offset);
+    `new_offset` stops right after the last separator, so a half-written trailing
+    entry is picked up again next time instead of being dropped.
+    """
+    f.seek(offset)
+    records, buffer = [], []
+    position = committed = offset
+
+    for line in f:
+        if not line.endswith(b"\n"):
+            break  # still being written
+        position += len(line)
+        while LOG_ENTRY_SEPARATOR in line:
+            head, _, line = line.partition(LOG_ENTRY_SEPARATOR)
+            buffer.append(head)
+            record = parse_log_entry(b"".join(buffer).decode("utf-8", errors="replace"))
+            if record is not None:
+                records.append(record)
+            buffer = []
+            committed = position - len(line)
+        buffer.append(line)
+    return records, committed
+
+
+def _load_log_state(state_file: str) -> dict:
+    try:
+        with open(state_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _save_log_state(state_file: str, state: dict):
+    tmp_path = state_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_file)
+
+
+def _records_file(state_file: str) -> str:
+    return os.path.splitext(state_file)[0] + ".records.jsonl"
+
+
+# records file -> (bytes read, records), so repeated reports in one process only read new lines
+_log_records_cache = {}
+
+
+def _read_log_records(records_file: str, size: int) -> list:
+    read, records = _log_records_cache.get(records_file, (0, []))
+    if read > size:
+        read, records = 0, []
+    if read < size:
+        with open(records_file, "rb") as f:
+            f.seek(read)
+            data = f.read(size - read)
+        records = records + [json.loads(line) for line in data.splitlines() if line.strip()]
+        _log_records_cache[records_file] = (size, records)
+    return records
+
+
+def extract_log_metrics(log_file: str = LOG_FILE, start_offset: int = None, state_file: str = None) -> list:
+    """
+    Legacy path: summary records scraped from llm_comparison.log.
+
+    Parsing is incremental: the byte offset reached is kept in `state_file`
+    (LOG_STATE_FILE next to the default log) and the parsed records are appended to a
+    JSONL file beside it, so each call only parses entries appended since the last one
+    and writes only those. A truncated or replaced log is detected from its size and
+    first bytes and re-parsed from the start.
+    With `start_offset`, only entries from that byte offset on are parsed and returned,
+    and the saved state is neither read nor updated.
+    """
+    if not os.path.exists(log_file):
         raise FileNotFoundError("Log file not found. Ensure comparison ran successfully.")
 
-    with open(LOG_FILE, "r") as f:
-        content = f.read()
-
-    entries = content.split("--------------------------------------------------")
-    summary = []
-
-    for entry in entries:
-        try:
-            provider = re.search(r"Provider: (\w+)", entry).group(1)
-            model = re.search(r"Model: ([\w\-\.:]+)", entry).group(1)
-            prompt = re.search(r"Prompt: ([\w_]+)", entry).group(1)
-            prompt_type = re.search(r"Prompt Type: ([\w\s]+)", entry).group(1)
-            input_tokens, output_tokens, total_tokens = map(
-                int,
-                re.findall(r"Tokens \(Input/Output/Total\): (\d+)/(\d+)/(\d+)", entry)[0]
-            )
-            response_time = float(re.search(r"Response Time: ([\d\.]+)s", entry).group(1))
-            flesch = re.search(r"Flesch Score: ([\d\.NA\-]+)", entry).group(1)
-            smog = re.search(r"SMOG Index: ([\d\.NA\-]+)", entry).group(1)
-            coleman_liau = re.search(r"Coleman-Liau Index: ([\d\.NA\-]+)", entry).group(1)
-            gunning_fog = re.search(r"Gunning Fog Index: ([\d\.NA\-]+)", entry).group(1)
-            ari = re.search(r"Automated Readability Index: ([\d\.NA\-]+)", entry).group(1)
-            dale_chall = re.search(r"Dale-Chall: ([\d\.NA\-]+)", entry).group(1)
-            forcast = re.search(r"FORCAST: ([\d\.NA\-]+)", entry).group(1)
-            linsear_write = re.search(r"Linsear Write: ([\d\.NA\-]+)", entry).group(1)
-            lix = re.search(r"LIX: ([\d\.NA\-]+)", entry).group(1)
-            rix = re.search(r"RIX: ([\d\.NA\-]+)", entry).group(1)
-
-
-            summary.append({
-                "provider": provider,
-                "model": model,
-                "prompt": prompt,
-                "prompt_type": prompt_type,
-                "input_tokens": input_tokens,
-                "output_tokens": output_tokens,
-                "total_tokens": total_tokens,
-                "response_time": response_time,
-                "flesch_score": flesch,
-                "smog_index": smog,
-                "coleman_liau_index": coleman_liau,
-                "gunning_fog_index": gunning_fog,
-                "ari_index": ari,
-                "dale_chall": dale_chall,
-                "forcast": forcast,
-                "linsear_write": linsear_write,
-                "lix": lix,
-                "rix": rix,
-            })
-        except Exception:
-            continue
-
-    return summary
-
-
-def generate_report(summary: list, user_question: str):
-    grouped = {}
-
-    for item in summary:
-        key = f"{item['provider']}::{item['model']}"
-        grouped.setdefault(key, []).append(item)
+    with open(log_file, "rb") as f:
+        if start_offset is not None:
+            records, _ = _parse_log_from(f, start_offset)
+            return records
+
+        head = f.read(_LOG_HEAD_BYTES).hex()
+        size = os.fstat(f.fileno()).st_size
+        state_file = state_file or (LOG_STATE_FILE if log_file == LOG_FILE else log_file + ".state.json")
+        records_file = _records_file(state_file)
+        records_available = os.path.getsize(records_file) if os.path.exists(records_file) else 0
+        state = _load_log_state(state_file)
+        fresh = (
+            state.get("log_file") != os.path.abspath(log_file)
+            or "records_size" not in state
+            or state["records_size"] > records_available
+            or state.get("offset", 0) > size
+            or not head.startswith(state.get("head", ""))
+        )
+        if fresh:
+            state = {"log_file": os.path.abspath(log_file), "offset": 0, "head": "", "records_size": 0}
+            _log_records_cache.pop(records_file, None)
+
+        records, offset = _parse_log_from(f, state["offset"])
+
+    if records or offset != state["offset"] or fresh:
+        with open(records_file, "ab") as out:
+            # Drops lines appended by a call that stopped before saving its state
+            out.truncate(state["records_size"])
+            out.seek(state["records_size"])
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            state["records_size"] = out.tell()
+        state["offset"] = offset
+        state["head"] = head
+        _save_log_state(state_file, state)
+    return _read_log_records(records_file, state["records_size"])
+
+
+def _float_column(values: list):
+    import numpy as np
+    import pandas as pd
+    try:
+        # Numbers and None (-> NaN): the common case for results-store records
+        return np.array(values, dtype="float64")
+    except (TypeError, ValueError):
+        return pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype="float64")
 
+
+def metrics_frame(summary: list):
+    """
+    Summary records as a pandas DataFrame: a categorical provider::model `key`, float64
+    metric columns (NaN where missing or "N/A"), token_source, throughput_basis and a flat
+    `samples` frame of every latency sample (frame.attrs["samples"]).
+    """
+    import itertools
+    import numpy as np
+    import pandas as pd
+    frame = pd.DataFrame({
+        field: _float_column([r.get(field) for r in summary]) for field in NUMERIC_FIELDS + READABILITY_FIELDS
+    })
+    frame["key"] = pd.Categorical([f"{r['provider']}::{r['model']}" for r in summary])
+    frame["token_source"] = [r.get("token_source") or "local" for r in summary]
+    frame["throughput_basis"] = [r.get("throughput_basis") for r in summary]
+
+    # Records without per-trial samples count their response time once
+    sample_lists = [r.get("latency_samples") or [r["response_time"]] for r in summary]
+    lengths = np.fromiter(map(len, sample_lists), dtype=np.int64, count=len(sample_lists))
+    frame.attrs["samples"] = pd.DataFrame({
+        "key": pd.Categorical.from_codes(np.repeat(frame["key"].cat.codes.to_numpy(), lengths), frame["key"].cat.categories),
+        "latency": _float_column(list(itertools.chain.from_iterable(sample_lists))),
+    })
+    return frame
+
+
+def _distributions(keys, values) -> dict:
+    """
+    summarize_samples() for every key in one group-by: {key: {"n", "mean", "stddev",
+    "p50", "p90", "p99", "ci_low", "ci_high", "min", "max"}}. NaN values are skipped;
+    keys with no values are left out.
+    """
+    import pandas as pd
+    series = pd.Series(values.to_numpy(), index=pd.CategoricalIndex(keys)).dropna()
+    grouped = series.groupby(level=0, observed=True, sort=False)
+    stats = pd.DataFrame({
+        "count": grouped.count(), "mean": grouped.mean(), "std": grouped.std(), "min": grouped.min(), "max": grouped.max(),
+    })
+    quantiles = grouped.quantile([0.5, 0.9, 0.99]).unstack()
+    distributions = {}
+    for key, (n, mean, stddev, low, high) in stats.iterrows():
+        n = int(n)
+        stddev = 0.0 if n < 2 else stddev
+        margin = t_critical(n - 1) * stddev / n ** 0.5 if n > 1 else 0.0
+        distributions[key] = {
+            "n": n,
+            "mean": round(mean, 4),
+            "stddev": round(stddev, 4),
+            "p50": round(quantiles.at[key, 0.5], 4),
+            "p90": round(quantiles.at[key, 0.9], 4),
+            "p99": round(quantiles.at[key, 0.99], 4),
+            "ci_low": round(mean - margin, 4),
+            "ci_high": round(mean + margin, 4),
+            "min": float(low),
+            "max": float(high),
+        }
+    return distributions
+
+
+def aggregate_metrics(frame) -> dict:
+    """
+    Every per-model statistic the report needs, computed column-wise with group-bys:
+    - `stats`: {"mean", "median", "std", "min", "max", "sum", "count"} -> DataFrame
+      (index: key, columns: metric fields)
+    - `size`: records per key, so missing counts are size - count
+    - `latency`: distributions (see _distributions) pooling each record's latency samples
+    - `output_tps`: {basis: distributions} per THROUGHPUT_BASES timing basis
+    - `prompt_tps`: distributions of the prompt-eval rate Ollama reports ("server" basis only)
+    - `server_timing`: mean load / prompt eval / eval time and count over the records Ollama timed
+    - `provider_tokens`: records with provider-reported token counts
+    """
+    fields = NUMERIC_FIELDS + READABILITY_FIELDS
+    grouped = frame.groupby("key", observed=True, sort=False)[fields]
+    stats = {
+        "mean": grouped.mean(), "median": grouped.median(), "std": grouped.std(),
+        "min": grouped.min(), "max": grouped.max(), "sum": grouped.sum(), "count": grouped.count(),
+    }
+
+    timed = frame[frame["eval_time"].notna()]
+    timed_grouped = timed.assign(
+        load_time=timed["load_time"].fillna(0.0), prompt_eval_time=timed["prompt_eval_time"].fillna(0.0)
+    ).groupby("key", observed=True, sort=False)[["load_time", "prompt_eval_time", "eval_time"]]
+    server_timing = timed_grouped.mean().assign(count=timed_grouped.size())
+
+    output_tps = {}
+    for basis in THROUGHPUT_BASES:
+        rows = frame["throughput_basis"] == basis
+        distributions = _distributions(frame["key"][rows], frame["output_tps"][rows])
+        if distributions:
+            output_tps[basis] = distributions
+    server = frame[frame["throughput_basis"] == "server"]
+    samples = frame.attrs["samples"]
+    return {
+        "stats": stats,
+        "size": frame.groupby("key", observed=True, sort=False).size(),
+        "latency": _distributions(samples["key"], samples["latency"]),
+        "output_tps": output_tps,
+        "prompt_tps": _distributions(server["key"], server["prompt_tps"]),
+        "server_timing": server_timing,
+        "provider_tokens": (frame["token_source"] == "provider").groupby(
+            frame["key"], observed=True, sort=False
+        ).sum(),
+    }
+
+
+def generate_report(summary: list, user_question: str, cache_mode: str = "off"):
+    """
+    Write the markdown performance report and return its path.
+    `cache_mode` follows utils.response_cache.CACHE_MODES for the Gemini insights call;
+    in "replay" mode a missing cached insight is skipped rather than requested.
+    """
     report_lines = ["# 📊 LLM Performance Report\n"]
     report_lines.append(f"**User Question:** {user_question}\n")
 
@@ -127,93 +417,164 @@ def generate_report(summary: list, user_question: str):
         ),
     }
 
-    for key, records in grouped.items():
+    frame = metrics_frame(summary)
+    aggregates = aggregate_metrics(frame)
+    stats = aggregates["stats"]
+    latency_by_model = aggregates["latency"]
+    throughput_by_basis = aggregates["output_tps"]
+
+    def stat(key, field, statistic="mean"):
+        value = stats[statistic].at[key, field]
+        return None if value != value else float(value)  # NaN -> None
+
+    def average(key, field):
+        value = stat(key, field)
+        return round(value, 2) if value is not None else "N/A"
+
+    readability_lines = [
+        ("📚", "Avg. Flesch Reading Ease", "flesch_score", "flesch"),
+        ("📖", "Avg. SMOG Index", "smog_index", "smog"),
+        ("✍️", "Avg. Coleman-Liau Index", "coleman_liau_index", "coleman_liau"),
+        ("🏛", "Avg. Gunning Fog Index", "gunning_fog_index", "gunning_fog"),
+        ("📐", "Avg. Automated Readability Index (ARI)", "ari_index", "ari"),
+        ("📖", "Avg. Dale-Chall Index", "dale_chall", "dale_chall"),
+        ("⚙️", "Avg. FORCAST Index", "forcast", "forcast"),
+        ("✈️", "Avg. Linsear Write Index", "linsear_write", "linsear_write"),
+        ("📏", "Avg. LIX", "lix", "lix"),
+        ("🔠", "Avg. RIX", "rix", "rix"),
+    ]
+
+    for key in stats["mean"].index:
+        size = int(aggregates["size"][key])
         report_lines.append(f"## 🔹 {key}")
-        avg_input = sum(r["input_tokens"] for r in records) / len(records)
-        avg_output = sum(r["output_tokens"] for r in records) / len(records)
-        avg_response_time = sum(r["response_time"] for r in records) / len(records)
-
-        # Collect scores safely
-        flesch_scores = [safe_float(r["flesch_score"]) for r in records if safe_float(r["flesch_score"]) is not None]
-        smog_scores = [safe_float(r["smog_index"]) for r in records if safe_float(r["smog_index"]) is not None]
-        cli_scores = [safe_float(r["coleman_liau_index"]) for r in records if safe_float(r["coleman_liau_index"]) is not None]
-        gf_scores = [safe_float(r["gunning_fog_index"]) for r in records if safe_float(r["gunning_fog_index"]) is not None]
-        ari_scores = [safe_float(r["ari_index"]) for r in records if safe_float(r["ari_index"]) is not None]
-        dale_chall_scores = [safe_float(r["dale_chall"]) for r in records if safe_float(r["dale_chall"]) is not None]
-        forcast_scores = [safe_float(r["forcast"]) for r in records if safe_float(r["forcast"]) is not None]
-        linsear_scores = [safe_float(r["linsear_write"]) for r in records if safe_float(r["linsear_write"]) is not None]
-        lix_scores = [safe_float(r["lix"]) for r in records if safe_float(r["lix"]) is not None]
-        rix_scores = [safe_float(r["rix"]) for r in records if safe_float(r["rix"]) is not None]
-
-
-        # Count failures
-        flesch_failures = len(records) - len(flesch_scores)
-        smog_failures = len(records) - len(smog_scores)
-        cli_failures = len(records) - len(cli_scores)
-        gf_failures = len(records) - len(gf_scores)
-        ari_failures = len(records) - len(ari_scores)
-        dale_chall_failures = len(records) - len(dale_chall_scores)
-        forcast_failures = len(records) - len(forcast_scores)
-        linsear_failures = len(records) - len(linsear_scores)
-        lix_failures = len(records) - len(lix_scores)
-        rix_failures = len(records) - len(rix_scores)
-
-        # Averages
-        avg_flesch = round(sum(flesch_scores) / len(flesch_scores), 2) if flesch_scores else "N/A"
-        avg_smog = round(sum(smog_scores) / len(smog_scores), 2) if smog_scores else "N/A"
-        avg_cli = round(sum(cli_scores) / len(cli_scores), 2) if cli_scores else "N/A"
-        avg_gf = round(sum(gf_scores) / len(gf_scores), 2) if gf_scores else "N/A"
-        avg_ari = round(sum(ari_scores) / len(ari_scores), 2) if ari_scores else "N/A"
-        avg_dale_chall = round(sum(dale_chall_scores) / len(dale_chall_scores), 2) if dale_chall_scores else "N/A"
-        avg_forcast = round(sum(forcast_scores) / len(forcast_scores), 2) if forcast_scores else "N/A"
-        avg_linsear = round(sum(linsear_scores) / len(linsear_scores), 2) if linsear_scores else "N/A"
-        avg_lix = round(sum(lix_scores) / len(lix_scores), 2) if lix_scores else "N/A"
-        avg_rix = round(sum(rix_scores) / len(rix_scores), 2) if rix_scores else "N/A"
-
-
-        report_lines.append(f"- 🔢 Average Input Tokens: {avg_input:.2f}")
-        report_lines.append(f"- 🔢 Average Output Tokens: {avg_output:.2f}")
-        report_lines.append(f"- ⏱️ Average Response Time: {avg_response_time:.2f} sec")
-        report_lines.append(f"- 📚 Avg. Flesch Reading Ease: {avg_flesch} ({interpretations['flesch']}) – ❌ Missing: {flesch_failures}")
-        report_lines.append(f"- 📖 Avg. SMOG Index: {avg_smog} ({interpretations['smog']}) – ❌ Missing: {smog_failures}")
-        report_lines.append(f"- ✍️ Avg. Coleman-Liau Index: {avg_cli} ({interpretations['coleman_liau']}) – ❌ Missing: {cli_failures}")
-        report_lines.append(f"- 🏛 Avg. Gunning Fog Index: {avg_gf} ({interpretations['gunning_fog']}) – ❌ Missing: {gf_failures}")
-        report_lines.append(f"- 📐 Avg. Automated Readability Index (ARI): {avg_ari} ({interpretations['ari']}) – ❌ Missing: {ari_failures}")
-        report_lines.append(f"- 📖 Avg. Dale-Chall Index: {avg_dale_chall} ({interpretations['dale_chall']}) – ❌ Missing: {dale_chall_failures}")
-        report_lines.append(f"- ⚙️ Avg. FORCAST Index: {avg_forcast} ({interpretations['forcast']}) – ❌ Missing: {forcast_failures}")
-        report_lines.append(f"- ✈️ Avg. Linsear Write Index: {avg_linsear} ({interpretations['linsear_write']}) – ❌ Missing: {linsear_failures}")
-        report_lines.append(f"- 📏 Avg. LIX: {avg_lix} ({interpretations['lix']}) – ❌ Missing: {lix_failures}")
-        report_lines.append(f"- 🔠 Avg. RIX: {avg_rix} ({interpretations['rix']}) – ❌ Missing: {rix_failures}")
+        report_lines.append(f"- 🔢 Average Input Tokens: {stat(key, 'input_tokens') or 0.0:.2f}")
+        report_lines.append(f"- 🔢 Average Output Tokens: {stat(key, 'output_tokens') or 0.0:.2f}")
+        provider_counted = int(aggregates["provider_tokens"][key])
+        if provider_counted < size:
+            report_lines.append(
+                f"- 🔢 Token Counts: {provider_counted} provider-reported, "
+                f"{size - provider_counted} partly or fully local tokenizer estimates"
+            )
+        report_lines.append(f"- ⏱️ Average Response Time: {stat(key, 'response_time') or 0.0:.2f} sec")
 
+        total_retries = int(stat(key, "retries", "sum") or 0)
+        if total_retries:
+            avg_wait = (stat(key, "throttle_wait", "sum") or 0.0) / size
+            report_lines.append(
+                f"- 🚦 Rate Limiting: {total_retries} retries, {avg_wait:.2f} sec average throttle wait "
+                f"(excluded from response time)"
+            )
+
+        # Ollama reports where the time went; model load is kept out of the comparison
+        server_timing = aggregates["server_timing"]
+        if key in server_timing.index:
+            timing = server_timing.loc[key]
+            report_lines.append(
+                f"- 🧮 Server Timing (avg of {int(timing['count'])}): load {timing['load_time']:.3f} sec | "
+                f"prompt eval {timing['prompt_eval_time']:.3f} sec | eval {timing['eval_time']:.3f} sec"
+            )
+
+        latency = latency_by_model[key]
+        report_lines.append(
+            f"- 📈 Latency Distribution (n={latency['n']}): p50 {latency['p50']}s | p90 {latency['p90']}s | "
+            f"p99 {latency['p99']}s | stddev {latency['stddev']}s | 95% CI of mean [{latency['ci_low']}, {latency['ci_high']}]s"
+        )
+
+        # Throughput normalizes for answer length: a long answer is not penalized for being long
+        for basis, distributions in throughput_by_basis.items():
+            output_dist = distributions.get(key)
+            if output_dist:
+                report_lines.append(
+                    f"- ⚡ Output Throughput ({basis} timing, n={output_dist['n']}): median {output_dist['p50']} tok/s | "
+                    f"mean {output_dist['mean']} ± {output_dist['stddev']} tok/s | "
+                    f"range {output_dist['min']:g}–{output_dist['max']:g} tok/s"
+                )
+        # Only Ollama's prompt eval time isolates prefill; TTFT also holds network and queueing
+        prompt_dist = aggregates["prompt_tps"].get(key)
+        if prompt_dist:
+            report_lines.append(
+                f"- 📥 Prompt Processing (server prompt eval, n={prompt_dist['n']}): median {prompt_dist['p50']} tok/s | "
+                f"mean {prompt_dist['mean']} ± {prompt_dist['stddev']} tok/s"
+            )
+
+        if stat(key, "ttft") is not None:
+            report_lines.append(f"- 🚀 Average Time to First Token: {stat(key, 'ttft'):.3f} sec")
+            if stat(key, "itl_p50") is not None:
+                report_lines.append(f"- ⏳ Average Median Inter-Token Latency: {stat(key, 'itl_p50'):.2f} ms")
+            if stat(key, "decode_tps") is not None:
+                report_lines.append(f"- 🏎️ Average Decode Speed: {stat(key, 'decode_tps'):.2f} tokens/sec")
+
+        for emoji, label, field, interpretation in readability_lines:
+            missing = size - int(stats["count"].at[key, field])
+            report_lines.append(
+                f"- {emoji} {label}: {average(key, field)} ({interpretations[interpretation]}) – ❌ Missing: {missing}"
+            )
+
+        report_lines.append("")
+
+    # Rank on the latency distribution rather than on single samples
+    if latency_by_model:
+        report_lines.append("## 🏁 Latency Ranking (by median, p90 as tie-breaker)")
+        ranked = sorted(latency_by_model.items(), key=lambda kv: (kv[1]["p50"], kv[1]["p90"]))
+        previous = None
+        for position, (key, latency) in enumerate(ranked, 1):
+            tie_note = ""
+            if previous is not None and latency["n"] > 1 and previous["n"] > 1 \
+                    and latency["ci_low"] <= previous["ci_high"]:
+                tie_note = " – ≈ not significantly slower than the model above (95% CIs overlap)"
+            report_lines.append(
+                f"{position}. {key}: p50 {latency['p50']}s, p90 {latency['p90']}s, p99 {latency['p99']}s "
+                f"(n={latency['n']}){tie_note}"
+            )
+            previous = latency
+        report_lines.append("")
+
+    # Ranked within each timing basis; rates from different bases are not comparable
+    if throughput_by_basis:
+        report_lines.append("## ⚡ Throughput Ranking (median output tokens/sec, higher is better)")
+        for basis, distributions in throughput_by_basis.items():
+            report_lines.append(f"### {basis.capitalize()} timing ({THROUGHPUT_BASES[basis]})")
+            ranked = sorted(distributions.items(), key=lambda kv: kv[1]["p50"], reverse=True)
+            for position, (key, dist) in enumerate(ranked, 1):
+                report_lines.append(f"{position}. {key}: {dist['p50']} tok/s (mean {dist['mean']}, n={dist['n']})")
         report_lines.append("")
 
     score_text = "\n".join(report_lines)
 
     # Ask Gemini to analyze based on numbers
-    gemini_summary = query_gemini_llm(
-        model="gemini-2.0-flash",
-        user_input=score_text,
-        prompt=(
-            "You are an objective evaluator. Given the performance metrics for multiple LLMs, "
-            "analyze only the numeric data below without any assumptions or external context. "
-            "Identify which model performs better strictly based on the following measurable factors:\n\n"
-            "- Average input/output tokens (efficiency)\n"
-            "- Average response time (speed)\n"
-            "- Average Flesch Reading Ease (clarity/readability)\n"
-            "- Average SMOG Index (education level needed)\n"
-            "- Average Coleman-Liau Index (grade level)\n"
-            "- Average Gunning Fog Index (long-form readability)\n\n"
-            "- Average Automated Readability Index (ARI)\n\n"
-            "- Average Dale-Chall Index (vocabulary difficulty)\n"
-            "- Average FORCAST Index (technical text readability)\n"
-            "- Average Linsear Write Index (military/technical readability)\n"
-            "- Average LIX Index (sentence/word complexity)\n"
-            "- Average RIX Index (long word ratio)\n\n"
-            "DO NOT add any subjective commentary or external knowledge. "
-            "Just summarize which model(s) have the strongest numeric performance for each metric, and conclude "
-            "which model performed better overall—purely based on these statistics."
-        )
+    insights_model = "gemini-2.0-flash"
+    insights_prompt = (
+        "You are an objective evaluator. Given the performance metrics for multiple LLMs, "
+        "analyze only the numeric data below without any assumptions or external context. "
+        "Identify which model performs better strictly based on the following measurable factors:\n\n"
+        "- Average input/output tokens (efficiency)\n"
+        "- Average response time (speed)\n"
+        "- Output and prompt-processing tokens per second (throughput)\n"
+        "- Average time to first token, inter-token latency and decode speed (when streamed)\n"
+        "- Average Flesch Reading Ease (clarity/readability)\n"
+        "- Average SMOG Index (education level needed)\n"
+        "- Average Coleman-Liau Index (grade level)\n"
+        "- Average Gunning Fog Index (long-form readability)\n\n"
+        "- Average Automated Readability Index (ARI)\n\n"
+        "- Average Dale-Chall Index (vocabulary difficulty)\n"
+        "- Average FORCAST Index (technical text readability)\n"
+        "- Average Linsear Write Index (military/technical readability)\n"
+        "- Average LIX Index (sentence/word complexity)\n"
+        "- Average RIX Index (long word ratio)\n\n"
+        "DO NOT add any subjective commentary or external knowledge. "
+        "Just summarize which model(s) have the strongest numeric performance for each metric, and conclude "
+        "which model performed better overall—purely based on these statistics."
     )
+    insights_key = make_cache_key("gemini", insights_model, insights_prompt, score_text)
+    cached = cache_get(insights_key) if cache_mode in ("use", "replay") else None
+    if cached is not None:
+        gemini_summary = cached["response"]
+    elif cache_mode == "replay":
+        gemini_summary = "_Skipped: no cached Gemini insights for these metrics (replay mode)._"
+    else:
+        gemini_summary = query_gemini_llm(model=insights_model, user_input=score_text, prompt=insights_prompt)
+        if cache_mode in ("use", "refresh"):
+            cache_put(insights_key, {"provider": "gemini", "model": insights_model, "response": gemini_summary})
     report_lines.append("## 🧠 Gemini Insights\n")
     report_lines.append(gemini_summary)
 
@@ -0,0 +1,137 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+
+# On-disk response cache: one JSON file per (provider, model, prompt, user_input, params) hash.
+# A file's mtime is its last access time, which drives LRU eviction.
+CACHE_DIR = ".llm_cache"
+CACHE_MAX_ENTRIES = 5000
+CACHE_MAX_BYTES = 200 * 1024 * 1024
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Supported modes for callers:
+# - off: never read or write
+# - use: read-through, call the provider on a miss and store the response
+# - refresh: always call the provider and overwrite the stored response
+# - replay: only read; a miss is an error and no provider is called
+CACHE_MODES = ("off", "use", "refresh", "replay")
+
+# Eviction scans the cache directory, so only run it every N writes
+_EVICT_EVERY = 25
+_writes_since_evict = 0
+_cache_lock = threading.Lock()
+
+
+def make_cache_key(provider: str, model: str, prompt: str, user_input: str, params: dict = None) -> str:
+    """Content hash of everything that determines a provider response."""
+    payload = json.dumps(
+        [provider, model, prompt, user_input, params or {}],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str, cache_dir: str) -> str:
+    # Two-level fan-out keeps directories small on large caches
+    return os.path.join(cache_dir, key[:2], f"{key}.json")
+
+
+def cache_get(key: str, cache_dir: str = CACHE_DIR, ttl: float = CACHE_TTL_SECONDS) -> dict | None:
+    path = _entry_path(key, cache_dir)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    if ttl is not None and time.time() - entry.get("created_at", 0) > ttl:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    try:
+        os.utime(path, None)  # mark as recently used
+    except OSError:
+        pass
+    return entry
+
+
+def cache_put(key: str, entry: dict, cache_dir: str = CACHE_DIR):
+    global _writes_since_evict
+    path = _entry_path(key, cache_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    record = {**entry, "key": key, "created_at": time.time()}
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(tmp_path, path)  # atomic, so readers never see a partial entry
+
+    with _cache_lock:
+        _writes_since_evict += 1
+        due = _writes_since_evict >= _EVICT_EVERY
+        if due:
+            _writes_since_evict = 0
+    if due:
+        prune_cache(cache_dir)
+
+
+def prune_cache(cache_dir: str = CACHE_DIR, max_entries: int = CACHE_MAX_ENTRIES,
+                max_bytes: int = CACHE_MAX_BYTES, ttl: float = CACHE_TTL_SECONDS) -> int:
+    """Drop expired entries, then least recently used ones until under both limits. Returns removed count."""
+    if not os.path.isdir(cache_dir):
+        return 0
+
+    now = time.time()
+    entries = []
+    for root, _, files in os.walk(cache_dir):
+        for name in files:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+
+    removed = 0
+    kept = []
+    for mtime, size, path in entries:
+        # mtime is refreshed on every hit, so it bounds the entry's age from below
+        if ttl is not None and now - mtime > ttl:
+            removed += _remove(path)
+        else:
+            kept.append((mtime, size, path))
+
+    kept.sort()  # oldest access first
+    total_bytes = sum(size for _, size, _ in kept)
+    count = len(kept)
+    for mtime, size, path in kept:
+        if count <= max_entries and total_bytes <= max_bytes:
+            break
+        removed += _remove(path)
+        count -= 1
+        total_bytes -= size
+
+    if removed:
+        logging.info(f"Response cache pruned {removed} entries ({count} left, {total_bytes} bytes)")
+    return removed
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
+
+
+def clear_cache(cache_dir: str = CACHE_DIR) -> int:
+    return prune_cache(cache_dir, max_entries=0, max_bytes=0)